@@ -0,0 +1,102 @@
+"""
+Simulate a provider whose latency degrades under load, with and without the adaptive concurrency limiter.
+
+The simulated provider serves `--capacity` requests concurrently at `--latency` seconds, every request beyond it adds
+queueing delay, and it sheds load with 503 once more than three times its capacity is in flight. Run with
+`python benchmarks/bench_adaptive_concurrency.py`.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from fastapi_oauth20.concurrency import AdaptiveConcurrencyLimiter
+from fastapi_oauth20.errors import OAuth20RequestError
+from fastapi_oauth20.oauth20 import OAuth20Base
+
+USERINFO = {'id': 123456, 'login': 'testuser', 'email': 'test@example.com'}
+
+
+class DegradingProvider(httpx.AsyncBaseTransport):
+    def __init__(self, capacity: int, latency: float) -> None:
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            if self.in_flight > 3 * self.capacity:
+                await asyncio.sleep(self.latency / 4)
+                return httpx.Response(503)
+            overload = max(self.in_flight - self.capacity, 0) / self.capacity
+            await asyncio.sleep(self.latency * (1 + 4 * overload))
+            return httpx.Response(200, json=USERINFO)
+        finally:
+            self.in_flight -= 1
+
+
+class SimulatedClient(OAuth20Base):
+    def __init__(self, provider: DegradingProvider, limiter: AdaptiveConcurrencyLimiter | None) -> None:
+        super().__init__(
+            'client_id',
+            'client_secret',
+            authorize_endpoint='https://provider.test/authorize',
+            access_token_endpoint='https://provider.test/token',
+            userinfo_endpoint='https://provider.test/user',
+            concurrency_limiter=limiter,
+        )
+        self.provider = provider
+
+    def create_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self.provider)
+
+
+async def run(limiter: AdaptiveConcurrencyLimiter | None, args: argparse.Namespace) -> None:
+    client = SimulatedClient(DegradingProvider(args.capacity, args.latency), limiter)
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(range(args.requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in pending:
+            start = time.perf_counter()
+            try:
+                await client.get_userinfo('token')
+            except OAuth20RequestError:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.callers)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    name = 'static  ' if limiter is None else 'adaptive'
+    limit = '' if limiter is None else f', final limit {limiter.get_limit("provider.test")}'
+    print(
+        f'{name}: {len(latencies) / elapsed:6.0f} ok/s, p50 {quantiles[49] * 1000:6.1f} ms, '
+        f'p99 {quantiles[98] * 1000:6.1f} ms, {errors} errors{limit}'
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--callers', type=int, default=200)
+    parser.add_argument('--capacity', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    await run(None, args)
+    await run(AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=200), args)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""
+Measure the per-request overhead of the `FastAPIOAuth20` dependency, excluding the token exchange itself.
+
+Compares the dependency with the per-request `inspect.signature` lookup it used to do. Run with
+`python benchmarks/bench_callback_dependency.py`.
+"""
+
+import argparse
+import asyncio
+import inspect
+import time
+
+from typing import Any
+
+from fastapi import Request
+
+from fastapi_oauth20 import FastAPIOAuth20, GoogleOAuth20
+
+
+class StubGoogleOAuth20(GoogleOAuth20):
+    async def get_access_token(self, code: str, redirect_uri: str, code_verifier: str | None = None) -> dict[str, Any]:
+        return {'access_token': code}
+
+
+class ReflectingFastAPIOAuth20(FastAPIOAuth20):
+    """The dependency as it was, inspecting the client signature on every callback."""
+
+    async def __call__(self, request: Request, code=None, state=None, code_verifier=None, error=None):
+        kwargs = {'code': code}
+        params = inspect.signature(self.client.get_access_token).parameters
+        if 'redirect_uri' in params and self.redirect_uri is not None:
+            kwargs['redirect_uri'] = self.redirect_uri
+        if 'code_verifier' in params and code_verifier is not None:
+            kwargs['code_verifier'] = code_verifier
+        return await self.client.get_access_token(**kwargs), state
+
+
+async def measure(dependency: FastAPIOAuth20, iterations: int) -> float:
+    request = Request({'type': 'http', 'method': 'GET', 'path': '/callback', 'headers': [], 'query_string': b''})
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await dependency(request, code='code', state='state', code_verifier='verifier')
+    return (time.perf_counter() - start) / iterations
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=100_000)
+    args = parser.parse_args()
+
+    client = StubGoogleOAuth20('client_id', 'client_secret')
+    redirect_uri = 'https://example.com/callback'
+    for name, dependency in (
+        ('reflection per call', ReflectingFastAPIOAuth20(client, redirect_uri=redirect_uri)),
+        ('precomputed        ', FastAPIOAuth20(client, redirect_uri=redirect_uri)),
+    ):
+        await measure(dependency, 1000)
+        print(f'{name}: {await measure(dependency, args.iterations) * 1e6:6.2f} us per callback')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Compare userinfo tail latency with and without hedging against a local latency-skewed provider.
+
+The provider answers most requests in `--latency` seconds and a `--slow-ratio` share of them in `--slow-latency`
+seconds. Requires the `bench` dependency group, e.g. `uv sync --group bench`, run with
+`python benchmarks/bench_hedging.py`.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from fastapi_oauth20.hedging import Hedger
+from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.transport import TransportRegistry
+
+HOST = '127.0.0.1'
+PORT = 8766
+USERINFO = b'{"id": 123456, "login": "testuser", "email": "test@example.com"}'
+
+
+def make_provider(args: argparse.Namespace):
+    async def provider(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        slow = random.random() < args.slow_ratio
+        await asyncio.sleep(args.slow_latency if slow else args.latency * random.uniform(0.8, 1.2))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': USERINFO})
+
+    return provider
+
+
+async def run(hedger: Hedger | None, args: argparse.Namespace) -> None:
+    registry = TransportRegistry(trust_env=False)
+    client = OAuth20Base(
+        'client_id',
+        'client_secret',
+        authorize_endpoint=f'http://{HOST}:{PORT}/authorize',
+        access_token_endpoint=f'http://{HOST}:{PORT}/token',
+        userinfo_endpoint=f'http://{HOST}:{PORT}/user',
+        transport_registry=registry,
+        hedger=hedger,
+    )
+    latencies: list[float] = []
+    pending = iter(range(args.requests))
+
+    async def worker() -> None:
+        for _ in pending:
+            start = time.perf_counter()
+            await client.get_userinfo('token')
+            latencies.append(time.perf_counter() - start)
+
+    async with client:
+        await asyncio.gather(*(worker() for _ in range(args.callers)))
+    await registry.aclose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    name = 'hedged  ' if hedger else 'baseline'
+    extra = ''
+    if hedger is not None:
+        stats = hedger.stats()
+        extra = f', {stats.hedged / stats.requests:.1%} hedged, {stats.hedge_wins} hedge wins'
+    print(
+        f'{name}: p50 {quantiles[49] * 1000:7.1f} ms, p95 {quantiles[94] * 1000:7.1f} ms, '
+        f'p99 {quantiles[98] * 1000:7.1f} ms{extra}'
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--callers', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.08)
+    parser.add_argument('--slow-latency', type=float, default=2.0)
+    parser.add_argument('--slow-ratio', type=float, default=0.02)
+    args = parser.parse_args()
+
+    config = Config()
+    config.bind = [f'{HOST}:{PORT}']
+    config.loglevel = 'WARNING'
+    config.keep_alive_max_requests = 1_000_000
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(serve(make_provider(args), config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    await run(None, args)
+    await run(Hedger(percentile=0.95), args)
+
+    shutdown.set()
+    await server
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
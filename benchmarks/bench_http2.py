@@ -0,0 +1,84 @@
+"""
+Compare userinfo throughput over HTTP/1.1 and HTTP/2 against a local provider.
+
+Requires the `bench` dependency group, e.g. `uv sync --group bench`, run with `python benchmarks/bench_http2.py`.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.transport import TransportRegistry
+
+HOST = '127.0.0.1'
+PORT = 8765
+USERINFO = b'{"id": 123456, "login": "testuser", "email": "test@example.com"}'
+
+
+async def provider(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+    await asyncio.sleep(0.02)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': USERINFO})
+
+
+class PriorKnowledgeRegistry(TransportRegistry):
+    """The local server speaks cleartext HTTP/2 (h2c), which httpx only uses with HTTP/1.1 disabled."""
+
+    def create_transport(
+        self, host: str, *, http2: bool = False, proxy: httpx.Proxy | None = None
+    ) -> httpx.AsyncHTTPTransport:
+        return httpx.AsyncHTTPTransport(http1=not http2, http2=http2, limits=self.get_limits(host), proxy=proxy)
+
+
+async def run(http2: bool, requests: int, connections: int) -> float:
+    registry = PriorKnowledgeRegistry(limits=httpx.Limits(max_connections=connections), trust_env=False)
+    client = OAuth20Base(
+        'client_id',
+        'client_secret',
+        authorize_endpoint=f'http://{HOST}:{PORT}/authorize',
+        access_token_endpoint=f'http://{HOST}:{PORT}/token',
+        userinfo_endpoint=f'http://{HOST}:{PORT}/user',
+        transport_registry=registry,
+        http2=http2,
+    )
+    async with client:
+        await client.get_userinfo('warmup')
+        start = time.perf_counter()
+        await asyncio.gather(*(client.get_userinfo('token') for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    await registry.aclose()
+    return requests / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--connections', type=int, default=10)
+    args = parser.parse_args()
+
+    config = Config()
+    config.bind = [f'{HOST}:{PORT}']
+    config.loglevel = 'WARNING'
+    config.keep_alive_max_requests = 1_000_000
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(serve(provider, config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    for http2 in (False, True):
+        throughput = await run(http2, args.requests, args.connections)
+        print(f'{"HTTP/2  " if http2 else "HTTP/1.1"}: {throughput:8.0f} req/s ({args.connections} connections max)')
+
+    shutdown.set()
+    await server
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
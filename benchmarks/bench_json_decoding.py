@@ -0,0 +1,211 @@
+"""
+Measure userinfo responses decoded per second for every provider client, with the standard library and the decoder.
+
+The payloads mirror the userinfo responses documented by each provider, with placeholder values. The fast decoder is
+orjson or msgspec when installed, see `fastapi_oauth20.decoder`. Run with `python benchmarks/bench_json_decoding.py`.
+"""
+
+import argparse
+import json
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+from fastapi_oauth20 import decoder
+
+AVATAR = 'https://avatars.example.com/u/1234567?v=4'
+
+PAYLOADS: dict[str, Any] = {
+    'feishu': {
+        'code': 0,
+        'msg': 'success',
+        'data': {
+            'name': '张三',
+            'en_name': 'San Zhang',
+            'avatar_url': AVATAR,
+            'avatar_thumb': AVATAR,
+            'avatar_middle': AVATAR,
+            'avatar_big': AVATAR,
+            'open_id': 'ou_c99c5f35d542efc7ee492afe11af19ef',
+            'union_id': 'on_d89jhsdhjsajkda7828enjdj328ydhhw3u43yjhdj',
+            'email': 'zhangsan@example.com',
+            'enterprise_email': 'zhangsan@example.cn',
+            'user_id': '5d9bdxxx',
+            'mobile': '+86130002883xx',
+            'tenant_key': '736588c92lxf175d',
+            'employee_no': '111222333',
+        },
+    },
+    'gitee': {
+        'id': 1234567,
+        'login': 'octocat',
+        'name': '章鱼猫',
+        'avatar_url': AVATAR,
+        'url': 'https://gitee.com/api/v5/users/octocat',
+        'html_url': 'https://gitee.com/octocat',
+        'remark': '',
+        'followers_url': 'https://gitee.com/api/v5/users/octocat/followers',
+        'following_url': 'https://gitee.com/api/v5/users/octocat/following_url{/other_user}',
+        'gists_url': 'https://gitee.com/api/v5/users/octocat/gists{/gist_id}',
+        'starred_url': 'https://gitee.com/api/v5/users/octocat/starred{/owner}{/repo}',
+        'subscriptions_url': 'https://gitee.com/api/v5/users/octocat/subscriptions',
+        'organizations_url': 'https://gitee.com/api/v5/users/octocat/orgs',
+        'repos_url': 'https://gitee.com/api/v5/users/octocat/repos',
+        'events_url': 'https://gitee.com/api/v5/users/octocat/events{/privacy}',
+        'received_events_url': 'https://gitee.com/api/v5/users/octocat/received_events',
+        'type': 'User',
+        'blog': None,
+        'weibo': None,
+        'bio': '',
+        'public_repos': 12,
+        'public_gists': 0,
+        'followers': 35,
+        'following': 4,
+        'stared': 80,
+        'watched': 90,
+        'created_at': '2018-03-10T12:00:00+08:00',
+        'updated_at': '2026-09-30T09:21:44+08:00',
+        'email': 'octocat@example.com',
+    },
+    'github': {
+        'login': 'octocat',
+        'id': 1234567,
+        'node_id': 'MDQ6VXNlcjE=',
+        'avatar_url': AVATAR,
+        'gravatar_id': '',
+        'url': 'https://api.github.com/users/octocat',
+        'html_url': 'https://github.com/octocat',
+        'followers_url': 'https://api.github.com/users/octocat/followers',
+        'following_url': 'https://api.github.com/users/octocat/following{/other_user}',
+        'gists_url': 'https://api.github.com/users/octocat/gists{/gist_id}',
+        'starred_url': 'https://api.github.com/users/octocat/starred{/owner}{/repo}',
+        'subscriptions_url': 'https://api.github.com/users/octocat/subscriptions',
+        'organizations_url': 'https://api.github.com/users/octocat/orgs',
+        'repos_url': 'https://api.github.com/users/octocat/repos',
+        'events_url': 'https://api.github.com/users/octocat/events{/privacy}',
+        'received_events_url': 'https://api.github.com/users/octocat/received_events',
+        'type': 'User',
+        'user_view_type': 'public',
+        'site_admin': False,
+        'name': 'monalisa octocat',
+        'company': 'GitHub',
+        'blog': 'https://github.com/blog',
+        'location': 'San Francisco',
+        'email': 'octocat@github.com',
+        'hireable': False,
+        'bio': 'There once was...',
+        'twitter_username': 'monatheoctocat',
+        'public_repos': 2,
+        'public_gists': 1,
+        'followers': 20,
+        'following': 0,
+        'created_at': '2008-01-14T04:33:35Z',
+        'updated_at': '2008-01-14T04:33:35Z',
+        'private_gists': 81,
+        'total_private_repos': 100,
+        'owned_private_repos': 100,
+        'disk_usage': 10000,
+        'collaborators': 8,
+        'two_factor_authentication': True,
+        'plan': {'name': 'Medium', 'space': 400, 'private_repos': 20, 'collaborators': 0},
+    },
+    'google': {
+        'id': '110248495921238986420',
+        'email': 'user@example.com',
+        'verified_email': True,
+        'name': 'Jane Doe',
+        'given_name': 'Jane',
+        'family_name': 'Doe',
+        'picture': 'https://lh3.googleusercontent.com/a/ACg8ocJ-placeholder=s96-c',
+        'locale': 'en',
+    },
+    'linuxdo': {
+        'id': 12345,
+        'sub': '12345',
+        'username': 'octocat',
+        'login': 'octocat',
+        'name': 'Octo Cat',
+        'email': 'u12345@linux.do',
+        'avatar_template': 'https://linux.do/user_avatar/linux.do/octocat/{size}/12345_2.png',
+        'avatar_url': 'https://linux.do/user_avatar/linux.do/octocat/288/12345_2.png',
+        'active': True,
+        'trust_level': 2,
+        'silenced': False,
+        'external_ids': None,
+        'api_key': '',
+    },
+    'oschina': {
+        'id': 1234567,
+        'email': 'octocat@example.com',
+        'name': '章鱼猫',
+        'gender': 'male',
+        'avatar': AVATAR,
+        'location': '广东 深圳',
+        'url': 'https://my.oschina.net/u/1234567',
+    },
+    'weixin_mp': {
+        'openid': 'o6_bmjrPTlm6_2sgVt7hMZOPfL2M',
+        'nickname': '微信用户',
+        'sex': 0,
+        'language': '',
+        'city': '',
+        'province': '',
+        'country': '',
+        'headimgurl': 'https://thirdwx.qlogo.cn/mmopen/vi_32/placeholder/132',
+        'privilege': [],
+        'unionid': 'o6_bmasdasdsad6_2sgVt7hMZOPfL',
+    },
+    'weixin_open': {
+        'openid': 'o6_bmjrPTlm6_2sgVt7hMZOPfL2M',
+        'nickname': '微信用户',
+        'sex': 1,
+        'language': 'zh_CN',
+        'province': 'Guangdong',
+        'city': 'Shenzhen',
+        'country': 'CN',
+        'headimgurl': 'https://thirdwx.qlogo.cn/mmopen/g3MonUZtNHkdmzicIlibx6iaFqAc56vxLSUfpb6n5WKSYVY0ChQKkiaJSgQ1dZuTOgvLLrhJbERQQ4eMsv84eavHiaiceqxibJxCfHe/0',
+        'privilege': ['PRIVILEGE1', 'PRIVILEGE2'],
+        'unionid': 'o6_bmasdasdsad6_2sgVt7hMZOPfL',
+    },
+}
+
+
+def stdlib_json(response: httpx.Response) -> Any:
+    """Decoding as before, `response.json()` with the standard library."""
+    return response.json()
+
+
+def fast_json(response: httpx.Response) -> Any:
+    return decoder.loads(response.content)
+
+
+def measure(decode: Callable[[httpx.Response], Any], response: httpx.Response, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(response)
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f'decoder: {decoder.JSON_DECODER}')
+    for provider, payload in PAYLOADS.items():
+        content = json.dumps(payload, ensure_ascii=False).encode()
+        response = httpx.Response(200, content=content, headers={'Content-Type': 'application/json'})
+        assert fast_json(response) == stdlib_json(response)
+        before = measure(stdlib_json, response, args.iterations)
+        after = measure(fast_json, response, args.iterations)
+        print(
+            f'{provider:12} {len(content):5} bytes: json {before:9.0f}/s, '
+            f'{decoder.JSON_DECODER} {after:9.0f}/s ({after / before:4.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure the per-call cost of building a token endpoint request, with and without HTTP Basic Authentication.
+
+Compares the precomputed client credentials with encoding the whole form and a fresh `httpx.BasicAuth` on each call
+as before, reporting the time per call and the peak memory held while building. Run with
+`python benchmarks/bench_token_request.py`.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from collections.abc import Callable
+
+import httpx
+
+from fastapi_oauth20 import GitHubOAuth20, LinuxDoOAuth20
+from fastapi_oauth20.oauth20 import OAuth20Base
+
+REDIRECT_URI = 'https://example.com/auth/callback'
+
+
+def build_before(client: OAuth20Base, code: str) -> httpx.Request:
+    """The token request as it was built, encoding the credentials and the Basic header on each call."""
+    data = {'grant_type': 'authorization_code', 'code': code, 'redirect_uri': REDIRECT_URI}
+    auth = None
+    if not client.token_endpoint_basic_auth:
+        data.update({'client_id': client.client_id, 'client_secret': client.client_secret})
+    else:
+        auth = httpx.BasicAuth(client.client_id, client.client_secret)
+    request = client.http_client.build_request(
+        'POST', client.access_token_endpoint, data=data, headers=client.request_headers
+    )
+    return request if auth is None else next(auth.auth_flow(request))
+
+
+def build_after(client: OAuth20Base, code: str) -> httpx.Request:
+    data = {'grant_type': 'authorization_code', 'code': code, 'redirect_uri': REDIRECT_URI}
+    return client.http_client.build_request(
+        'POST',
+        client.access_token_endpoint,
+        **client.build_form_request(data, basic_auth=client.token_endpoint_basic_auth),
+    )
+
+
+def measure(build: Callable[[OAuth20Base, str], httpx.Request], client: OAuth20Base, iterations: int) -> str:
+    codes = [f'code_{i:08d}' for i in range(iterations)]
+    start = time.perf_counter()
+    for code in codes:
+        build(client, code)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for code in codes[:1000]:
+        build(client, code)
+    # Every request built is dropped right away, so the peak is what a single call holds at once
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return f'{elapsed / iterations * 1e6:6.2f} us/call, peak {peak / 1024:6.1f} KiB'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=50_000)
+    args = parser.parse_args()
+
+    clients = {
+        'form credentials': GitHubOAuth20('client_id', 'client_secret'),
+        'basic auth': LinuxDoOAuth20('client_id', 'client_secret'),
+    }
+    for name, client in clients.items():
+        for label, build in (('before', build_before), ('after ', build_after)):
+            print(f'{name:16} {label}: {measure(build, client, args.iterations)}')
+
+
+if __name__ == '__main__':
+    main()
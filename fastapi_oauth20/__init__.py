@@ -1,5 +1,9 @@
+from .cache import CacheBackend as CacheBackend
+from .cache import MemoryCache as MemoryCache
+from .cache import SQLiteCache as SQLiteCache
 from .callback import FastAPIOAuth20 as FastAPIOAuth20
 from .callback import OAuth20AuthorizeCallbackError as OAuth20AuthorizeCallbackError
+from .circuitbreaker import CircuitBreaker as CircuitBreaker
 from .clients.feishu import FeiShuOAuth20 as FeiShuOAuth20
 from .clients.gitee import GiteeOAuth20 as GiteeOAuth20
 from .clients.github import GitHubOAuth20 as GitHubOAuth20
@@ -8,5 +12,19 @@ from .clients.linuxdo import LinuxDoOAuth20 as LinuxDoOAuth20
 from .clients.oschina import OSChinaOAuth20 as OSChinaOAuth20
 from .clients.weixin_mp import WeChatMpOAuth20 as WeChatMpOAuth20
 from .clients.weixin_open import WeChatOpenOAuth20 as WeChatOpenOAuth20
+from .concurrency import AdaptiveConcurrencyLimiter as AdaptiveConcurrencyLimiter
+from .deadline import deadline as deadline
+from .hedging import Hedger as Hedger
+from .lifespan import oauth20_lifespan as oauth20_lifespan
+from .ratelimit import RateLimitTracker as RateLimitTracker
+from .ratelimit import TokenBucketLimiter as TokenBucketLimiter
+from .results import TokenResponse as TokenResponse
+from .results import UserInfo as UserInfo
+from .retry import RetryPolicy as RetryPolicy
+from .scheduler import RequestScheduler as RequestScheduler
+from .scheduler import priority as priority
+from .token import TokenManager as TokenManager
+from .transport import TransportRegistry as TransportRegistry
+from .userinfo import UserInfoCache as UserInfoCache
 
 __version__ = '0.0.3'
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any, Generic, Protocol, TypeVar
+
+_V = TypeVar('_V')
+
+
+class LRUCache(Generic[_V]):
+    """In-memory LRU cache with bounded size and per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        """
+        Initialize LRU cache.
+
+        :param maxsize: Maximum number of entries, the least recently used entry is evicted beyond it.
+        :param ttl: Default time to live of entries in seconds, None keeps entries until they are evicted.
+        :return:
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float | None, _V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> _V | None:
+        """
+        Get an entry and mark it as recently used, expired entries are evicted.
+
+        :param key: The cache key.
+        :return:
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: _V, ttl: float | None = None) -> None:
+        """
+        Set an entry, evicting the least recently used entries beyond the maximum size.
+
+        :param key: The cache key.
+        :param value: The value to cache.
+        :param ttl: Time to live of the entry in seconds, defaults to the cache TTL.
+        :return:
+        """
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (None if ttl is None else time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> list[tuple[Hashable, _V]]:
+        """
+        Get all unexpired entries, from the least to the most recently used.
+
+        :return:
+        """
+        now = time.monotonic()
+        return [
+            (key, value) for key, (expires_at, value) in self._data.items() if expires_at is None or expires_at > now
+        ]
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Delete an entry if present.
+
+        :param key: The cache key.
+        :return:
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Delete all entries.
+
+        :return:
+        """
+        self._data.clear()
+
+
+class CacheBackend(Protocol):
+    """Async key-value cache used by the caching features of the library, values must be JSON serializable."""
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Get a value, None if missing or expired.
+
+        :param key: The cache key.
+        :return:
+        """
+        ...
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """
+        Set a value.
+
+        :param key: The cache key.
+        :param value: The value to cache.
+        :param ttl: Time to live of the value in seconds, None keeps it until it is evicted.
+        :return:
+        """
+        ...
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a value if present.
+
+        :param key: The cache key.
+        :return:
+        """
+        ...
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Get several values at once, missing or expired keys are left out of the result.
+
+        :param keys: The cache keys.
+        :return:
+        """
+        ...
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        """
+        Set several values at once.
+
+        :param items: The values to cache by key.
+        :param ttl: Time to live of the values in seconds, None keeps them until they are evicted.
+        :return:
+        """
+        ...
+
+
+class MemoryCache:
+    """In-process cache backend on top of an LRU cache."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        """
+        Initialize memory cache backend.
+
+        :param maxsize: Maximum number of entries, the least recently used entry is evicted beyond it.
+        :param ttl: Default time to live of entries in seconds, None keeps entries until they are evicted.
+        :return:
+        """
+        self.cache: LRUCache[Any] = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Any | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        values = ((key, self.cache.get(key)) for key in keys)
+        return {key: value for key, value in values if value is not None}
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        for key, value in items.items():
+            self.cache.set(key, value, ttl=ttl)
+
+
+class SQLiteCache:
+    """SQLite cache backend in WAL mode, shared by all worker processes of a host using the same database file."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        table: str = 'fastapi_oauth20_cache',
+        timeout: float = 5.0,
+        purge_interval: int = 1000,
+    ) -> None:
+        """
+        Initialize SQLite cache backend.
+
+        :param path: Path of the SQLite database file.
+        :param table: Name of the cache table, created on first use.
+        :param timeout: Seconds to wait for a lock held by another process.
+        :param purge_interval: Number of writes after which expired entries are deleted.
+        :return:
+        """
+        if not table.isidentifier():
+            raise ValueError(f'Invalid cache table name: {table}')
+        self.path = path
+        self.table = table
+        self.timeout = timeout
+        self.purge_interval = purge_interval
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+            )
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func: Callable[..., _V], *args: Any) -> _V:
+        def run() -> _V:
+            with self._lock:
+                return func(self._connect(), *args)
+
+        return await asyncio.to_thread(run)
+
+    def _get_many(self, connection: sqlite3.Connection, keys: list[str]) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        now = time.time()
+        # Stay below the default SQLite limit of host parameters per statement
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = connection.execute(
+                f'SELECT key, value FROM {self.table} '
+                f'WHERE key IN ({placeholders}) AND (expires_at IS NULL OR expires_at > ?)',
+                [*chunk, now],
+            )
+            result.update((key, json.loads(value)) for key, value in rows)
+        return result
+
+    def _set_many(self, connection: sqlite3.Connection, items: Mapping[str, Any], ttl: float | None) -> None:
+        expires_at = None if ttl is None else time.time() + ttl
+        rows = [(key, json.dumps(value, separators=(',', ':')), expires_at) for key, value in items.items()]
+        with connection:
+            connection.executemany(f'INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)', rows)
+            self._writes += len(rows)
+            if self._writes >= self.purge_interval:
+                self._writes = 0
+                connection.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+
+    def _delete(self, connection: sqlite3.Connection, key: str) -> None:
+        with connection:
+            connection.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    async def get(self, key: str) -> Any | None:
+        return (await self._run(self._get_many, [key])).get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self._run(self._set_many, {key: value}, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        return await self._run(self._get_many, list(keys))
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None = None) -> None:
+        await self._run(self._set_many, items, ttl)
+
+    async def aclose(self) -> None:
+        """
+        Close the database connection.
+
+        :return:
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -1,4 +1,5 @@
 import inspect
+import math
 
 from typing import Annotated, Any
 
@@ -6,8 +7,10 @@ import httpx
 
 from fastapi import HTTPException, Query, Request
 
-from fastapi_oauth20.errors import OAuth20BaseError, OAuth20RequestError
+from fastapi_oauth20.deadline import deadline
+from fastapi_oauth20.errors import CircuitOpenError, DeadlineExceededError, OAuth20BaseError, OAuth20RequestError
 from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.scheduler import priority
 
 
 class OAuth20AuthorizeCallbackError(HTTPException, OAuth20BaseError):
@@ -41,16 +44,27 @@ class FastAPIOAuth20:
         client: OAuth20Base,
         *,
         redirect_uri: str | None = None,
+        timeout: float | None = None,
     ):
         """
         Initialize FastAPI OAuth2 callback handler.
 
         :param client: An OAuth2 client instance that inherits from OAuth20Base.
         :param redirect_uri: The full callback URL where the OAuth2 provider redirects after authorization. Must match the URL registered with the OAuth2 provider.
+        :param timeout: Seconds the whole callback may take, the token exchange gets only the time left. The deadline is
+            stored as `request.state.oauth20_deadline` to bound later requests, e.g. the userinfo retrieval.
         :return:
         """
         self.client = client
         self.redirect_uri = redirect_uri
+        self.timeout = timeout
+
+        # Resolve once which arguments the client accepts, keeping reflection off the callback path
+        params = inspect.signature(client.get_access_token).parameters
+        self._static_kwargs: dict[str, str] = {}
+        if 'redirect_uri' in params and redirect_uri is not None:
+            self._static_kwargs['redirect_uri'] = redirect_uri
+        self._pass_code_verifier = 'code_verifier' in params
 
     async def __call__(
         self,
@@ -76,19 +90,20 @@ class FastAPIOAuth20:
                 detail=error if error is not None else None,
             )
 
-        kwargs: dict[str, str] = {'code': code}
-
-        try:
-            sig = inspect.signature(self.client.get_access_token)
-            params = sig.parameters
+        kwargs = {'code': code, **self._static_kwargs}
 
-            if 'redirect_uri' in params and self.redirect_uri is not None:
-                kwargs['redirect_uri'] = self.redirect_uri
+        if self._pass_code_verifier and code_verifier is not None:
+            kwargs['code_verifier'] = code_verifier
 
-            if 'code_verifier' in params and code_verifier is not None:
-                kwargs['code_verifier'] = code_verifier
-
-            access_token = await self.client.get_access_token(**kwargs)
+        try:
+            with priority('interactive'), deadline(self.timeout) as deadline_at:
+                request.state.oauth20_deadline = deadline_at
+                access_token = await self.client.get_access_token(**kwargs)
+        except DeadlineExceededError as e:
+            raise OAuth20AuthorizeCallbackError(status_code=504, detail=e.msg) from e
+        except CircuitOpenError as e:
+            headers = None if e.retry_after is None else {'Retry-After': str(math.ceil(e.retry_after))}
+            raise OAuth20AuthorizeCallbackError(status_code=503, detail=e.msg, headers=headers) from e
         except OAuth20RequestError as e:
             raise OAuth20AuthorizeCallbackError(
                 status_code=500,
@@ -0,0 +1,172 @@
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Literal
+
+from fastapi_oauth20.errors import CircuitOpenError
+
+CircuitState = Literal['closed', 'open', 'half_open']
+
+
+@dataclass
+class Circuit:
+    """State of the circuit of one provider endpoint."""
+
+    state: CircuitState = 'closed'
+    calls: deque[tuple[bool, bool]] = field(default_factory=deque)
+    opened_at: float = 0.0
+    probes: int = 0
+    generation: int = 0
+
+
+class CircuitBreaker:
+    """Circuit breaker per provider endpoint, opening on high error rate or latency and probing in half-open state."""
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float | None = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        """
+        Initialize circuit breaker.
+
+        :param failure_rate_threshold: Rate of failed calls in the window, transport errors and 5xx responses, from
+            which the circuit opens.
+        :param slow_call_duration: Seconds from which a call counts as slow, None ignores latency.
+        :param slow_call_rate_threshold: Rate of slow calls in the window from which the circuit opens.
+        :param window_size: Number of most recent calls the rates are computed over.
+        :param min_calls: Minimum number of calls in the window before the circuit can open.
+        :param open_duration: Seconds the circuit stays open before letting probe calls through.
+        :param half_open_max_calls: Number of concurrent probe calls in half-open state, the circuit closes once they
+            all succeed.
+        :return:
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self._circuits: dict[str, Circuit] = {}
+
+    def get_state(self, key: str) -> CircuitState:
+        """
+        Get the state of the circuit of an endpoint.
+
+        :param key: The circuit key, the endpoint URL.
+        :return:
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return 'closed'
+        if circuit.state == 'open' and time.monotonic() - circuit.opened_at >= self.open_duration:
+            return 'half_open'
+        return circuit.state
+
+    def check(self, key: str) -> None:
+        """
+        Fail fast with `CircuitOpenError` if the circuit would not let a call through, without letting it through.
+
+        Lets callers bail out before waiting for or spending shared resources, e.g. rate limit tokens.
+
+        :param key: The circuit key, the endpoint URL.
+        :return:
+        """
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state == 'closed':
+            return
+
+        if circuit.state == 'open':
+            retry_after = circuit.opened_at + self.open_duration - time.monotonic()
+            if retry_after > 0:
+                raise CircuitOpenError(f'Circuit open for {key}', retry_after=retry_after)
+        elif circuit.probes >= self.half_open_max_calls:
+            raise CircuitOpenError(f'Circuit half-open for {key}, probe in progress', retry_after=0.0)
+
+    def acquire(self, key: str) -> int:
+        """
+        Let a call through, or fail fast with `CircuitOpenError` while the circuit is open.
+
+        Every call let through must be followed by `record` or `release` with the returned generation of the circuit,
+        so that outcomes of calls let through before the circuit last changed its state are ignored.
+
+        :param key: The circuit key, the endpoint URL.
+        :return:
+        """
+        self.check(key)
+        circuit = self._circuits.setdefault(key, Circuit())
+        if circuit.state == 'closed':
+            return circuit.generation
+
+        if circuit.state == 'open':
+            self._transition(circuit, 'half_open')
+        circuit.probes += 1
+        return circuit.generation
+
+    def release(self, key: str, generation: int) -> None:
+        """
+        Release a call that ended without an outcome, e.g. cancelled, freeing its probe slot.
+
+        :param key: The circuit key, the endpoint URL.
+        :param generation: The generation returned by `acquire` for the call.
+        :return:
+        """
+        circuit = self._circuits.get(key)
+        if circuit is not None and circuit.generation == generation and circuit.state == 'half_open':
+            circuit.probes = max(circuit.probes - 1, 0)
+
+    def record(self, key: str, generation: int, *, failed: bool, duration: float) -> None:
+        """
+        Record the outcome of a call and update the circuit state.
+
+        :param key: The circuit key, the endpoint URL.
+        :param generation: The generation returned by `acquire` for the call.
+        :param failed: Whether the call failed.
+        :param duration: Duration of the call in seconds.
+        :return:
+        """
+        circuit = self._circuits.setdefault(key, Circuit())
+        if circuit.generation != generation:
+            # A call let through before the circuit last changed its state, e.g. a slow call that was let through
+            # while closed and answers once a probe is in flight, its outcome says nothing about the current state
+            return
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+
+        if circuit.state == 'half_open':
+            circuit.probes = max(circuit.probes - 1, 0)
+            if failed or slow:
+                self._transition(circuit, 'open')
+            elif circuit.probes == 0:
+                self._transition(circuit, 'closed')
+            return
+
+        circuit.calls.append((failed, slow))
+        if len(circuit.calls) > self.window_size:
+            circuit.calls.popleft()
+        if len(circuit.calls) < self.min_calls:
+            return
+
+        total = len(circuit.calls)
+        failure_rate = sum(call[0] for call in circuit.calls) / total
+        slow_rate = sum(call[1] for call in circuit.calls) / total
+        if failure_rate >= self.failure_rate_threshold or (
+            self.slow_call_duration is not None and slow_rate >= self.slow_call_rate_threshold
+        ):
+            self._transition(circuit, 'open')
+
+    @staticmethod
+    def _transition(circuit: Circuit, state: CircuitState) -> None:
+        circuit.state = state
+        circuit.generation += 1
+        circuit.probes = 0
+        circuit.calls.clear()
+        if state == 'open':
+            circuit.opened_at = time.monotonic()
@@ -1,15 +1,18 @@
+from typing import Any
+
 from fastapi_oauth20.oauth20 import OAuth20Base
 
 
 class FeiShuOAuth20(OAuth20Base):
     """FeiShu (Lark) OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize FeiShu OAuth2 client.
 
         :param client_id: FeiShu app client ID from the FeiShu developer console.
         :param client_secret: FeiShu app client secret from the FeiShu developer console.
+        :param kwargs: Additional options passed to OAuth20Base.
         :return:
         """
         super().__init__(
@@ -24,4 +27,5 @@ class FeiShuOAuth20(OAuth20Base):
                 'contact:user.base:readonly',
                 'contact:user.email:readonly',
             ],
+            **kwargs,
         )
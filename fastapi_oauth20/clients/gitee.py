@@ -1,17 +1,22 @@
+from typing import Any
+
 from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.ratelimit import RateLimitTracker
 
 
 class GiteeOAuth20(OAuth20Base):
     """Gitee OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize Gitee OAuth2 client.
 
         :param client_id: Gitee OAuth application client ID.
         :param client_secret: Gitee OAuth application client secret.
+        :param kwargs: Additional options passed to OAuth20Base, a rate limit tracker is used unless one is given.
         :return:
         """
+        kwargs.setdefault('rate_limit_tracker', RateLimitTracker())
         super().__init__(
             client_id=client_id,
             client_secret=client_secret,
@@ -20,4 +25,5 @@ class GiteeOAuth20(OAuth20Base):
             refresh_token_endpoint='https://gitee.com/oauth/token',
             userinfo_endpoint='https://gitee.com/api/v5/user',
             default_scopes=['user_info'],
+            **kwargs,
         )
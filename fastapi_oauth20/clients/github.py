@@ -1,24 +1,45 @@
-import json
+import asyncio
+import hashlib
 
 from typing import Any, cast
 
 import httpx
 
+from fastapi_oauth20 import decoder
+from fastapi_oauth20.cache import CacheBackend
 from fastapi_oauth20.errors import GetUserInfoError
 from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.ratelimit import RateLimitTracker
+from fastapi_oauth20.results import UserInfo
 
 
 class GitHubOAuth20(OAuth20Base):
     """GitHub OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        *,
+        concurrent_emails: bool = False,
+        etag_cache: CacheBackend | None = None,
+        etag_ttl: float | None = 86400.0,
+        **kwargs: Any,
+    ):
         """
         Initialize GitHub OAuth2 client.
 
         :param client_id: GitHub OAuth App client ID.
         :param client_secret: GitHub OAuth App client secret.
+        :param concurrent_emails: Whether to fetch `/user/emails` concurrently with `/user` instead of only after it
+            returned no public email, requires the `user:email` scope.
+        :param etag_cache: Cache backend storing the ETag and profile per token, enables conditional `/user` requests
+            whose 304 responses do not count against the GitHub rate limit.
+        :param etag_ttl: Seconds an ETag and profile are kept in the ETag cache.
+        :param kwargs: Additional options passed to OAuth20Base, a rate limit tracker is used unless one is given.
         :return:
         """
+        kwargs.setdefault('rate_limit_tracker', RateLimitTracker())
         super().__init__(
             client_id=client_id,
             client_secret=client_secret,
@@ -26,9 +47,14 @@ class GitHubOAuth20(OAuth20Base):
             access_token_endpoint='https://github.com/login/oauth/access_token',
             userinfo_endpoint='https://api.github.com/user',
             default_scopes=['user', 'user:email'],
+            **kwargs,
         )
+        self.concurrent_emails = concurrent_emails
+        self.etag_cache = etag_cache
+        self.etag_ttl = etag_ttl
+        self._discarded: set[asyncio.Task[httpx.Response]] = set()
 
-    async def get_userinfo(self, access_token: str) -> dict[str, Any]:
+    async def get_userinfo(self, access_token: str) -> UserInfo:
         """
         Retrieve user information from GitHub API.
 
@@ -36,21 +62,77 @@ class GitHubOAuth20(OAuth20Base):
         :return:
         """
         headers = {'Authorization': f'Bearer {access_token}'}
-        async with httpx.AsyncClient(headers=headers) as client:
-            response = await client.get(self.userinfo_endpoint)
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=GetUserInfoError)
+        emails_url = f'{self.userinfo_endpoint}/emails'
+
+        if not self.concurrent_emails:
+            result = await self.get_user(access_token, headers)
+
+            if result.get('email') is None:
+                response = await self.request('GET', emails_url, headers=headers, endpoint='userinfo')
+                result['email'] = self.get_primary_email(response)
 
-            email = result.get('email')
-            if email is None:
-                response = await client.get(f'{self.userinfo_endpoint}/emails')
-                self.raise_httpx_oauth20_errors(response)
-                try:
-                    emails = cast(list[dict[str, Any]], response.json())
-                except json.JSONDecodeError as e:
-                    raise GetUserInfoError('Result serialization failed.', response) from e
+            return result
 
-                email = next((email['email'] for email in emails if email.get('primary')), emails[0]['email'])
-                result['email'] = email
+        emails_task = asyncio.ensure_future(self.request('GET', emails_url, headers=headers, endpoint='userinfo'))
+        try:
+            result = await self.get_user(access_token, headers)
+        except BaseException:
+            self._discard(emails_task)
+            raise
 
+        if result.get('email') is not None:
+            self._discard(emails_task)
             return result
+
+        result['email'] = self.get_primary_email(await emails_task)
+        return result
+
+    async def get_user(self, access_token: str, headers: dict[str, str]) -> UserInfo:
+        """
+        Retrieve the GitHub `/user` profile, conditionally on the cached ETag when an ETag cache is configured.
+
+        :param access_token: Valid GitHub access token.
+        :param headers: The request headers carrying the access token.
+        :return:
+        """
+        if self.etag_cache is None:
+            response = await self.request('GET', self.userinfo_endpoint, headers=headers, endpoint='userinfo')
+            self.raise_httpx_oauth20_errors(response)
+            return UserInfo(self.get_json_result(response, err_class=GetUserInfoError))
+
+        key = f'fastapi_oauth20:github:etag:{hashlib.sha256(access_token.encode()).hexdigest()}'
+        cached = await self.etag_cache.get(key)
+        if cached is not None:
+            headers = {**headers, 'If-None-Match': cached['etag']}
+
+        response = await self.request('GET', self.userinfo_endpoint, headers=headers, endpoint='userinfo')
+        if cached is not None and response.status_code == 304:
+            return UserInfo(cached['body'])
+
+        self.raise_httpx_oauth20_errors(response)
+        result = UserInfo(self.get_json_result(response, err_class=GetUserInfoError))
+        etag = response.headers.get('ETag')
+        if etag is not None:
+            await self.etag_cache.set(key, {'etag': etag, 'body': dict(result)}, ttl=self.etag_ttl)
+        return result
+
+    def get_primary_email(self, response: httpx.Response) -> str:
+        """
+        Extract the primary email, or the first one, from a GitHub `/user/emails` response.
+
+        :param response: The HTTP response of the emails endpoint.
+        :return:
+        """
+        self.raise_httpx_oauth20_errors(response)
+        try:
+            emails = cast(list[dict[str, Any]], decoder.loads(response.content))
+        except decoder.DECODE_ERRORS as e:
+            raise GetUserInfoError('Result serialization failed.', response) from e
+
+        return next((email['email'] for email in emails if email.get('primary')), emails[0]['email'])
+
+    def _discard(self, task: asyncio.Task[httpx.Response]) -> None:
+        # Let the unneeded request complete so its connection goes back to the pool instead of being torn down
+        self._discarded.add(task)
+        task.add_done_callback(self._discarded.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
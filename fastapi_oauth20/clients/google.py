@@ -1,15 +1,18 @@
+from typing import Any
+
 from fastapi_oauth20.oauth20 import OAuth20Base
 
 
 class GoogleOAuth20(OAuth20Base):
     """Google OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize Google OAuth2 client.
 
         :param client_id: Google OAuth 2.0 client ID from Google Cloud Console.
         :param client_secret: Google OAuth 2.0 client secret from Google Cloud Console.
+        :param kwargs: Additional options passed to OAuth20Base.
         :return:
         """
         super().__init__(
@@ -21,4 +24,5 @@ class GoogleOAuth20(OAuth20Base):
             revoke_token_endpoint='https://accounts.google.com/o/oauth2/revoke',
             userinfo_endpoint='https://www.googleapis.com/oauth2/v1/userinfo',
             default_scopes=['email', 'openid', 'profile'],
+            **kwargs,
         )
@@ -1,15 +1,18 @@
+from typing import Any
+
 from fastapi_oauth20.oauth20 import OAuth20Base
 
 
 class LinuxDoOAuth20(OAuth20Base):
     """Linux.do OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize Linux.do OAuth2 client.
 
         :param client_id: Linux.do OAuth application client ID.
         :param client_secret: Linux.do OAuth application client secret.
+        :param kwargs: Additional options passed to OAuth20Base.
         :return:
         """
         super().__init__(
@@ -20,4 +23,5 @@ class LinuxDoOAuth20(OAuth20Base):
             refresh_token_endpoint='https://connect.linux.do/oauth2/token',
             userinfo_endpoint='https://connect.linux.do/api/user',
             token_endpoint_basic_auth=True,
+            **kwargs,
         )
@@ -1,15 +1,18 @@
+from typing import Any
+
 from fastapi_oauth20.oauth20 import OAuth20Base
 
 
 class OSChinaOAuth20(OAuth20Base):
     """OSChina OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize OSChina OAuth2 client.
 
         :param client_id: OSChina OAuth application client ID.
         :param client_secret: OSChina OAuth application client secret.
+        :param kwargs: Additional options passed to OAuth20Base.
         :return:
         """
         super().__init__(
@@ -19,4 +22,5 @@ class OSChinaOAuth20(OAuth20Base):
             access_token_endpoint='https://www.oschina.net/action/openapi/token',
             refresh_token_endpoint='https://www.oschina.net/action/openapi/token',
             userinfo_endpoint='https://www.oschina.net/action/openapi/user',
+            **kwargs,
         )
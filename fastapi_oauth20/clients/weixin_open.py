@@ -1,21 +1,20 @@
 from typing import Any
-from urllib.parse import urlencode
-
-import httpx
 
 from fastapi_oauth20.errors import AccessTokenError, GetUserInfoError, RefreshTokenError
 from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.results import TokenResponse, UserInfo
 
 
 class WeChatOpenOAuth20(OAuth20Base):
     """WeChat open platform OAuth2 client implementation."""
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, **kwargs: Any):
         """
         Initialize WeChat open platform OAuth2 client.
 
         :param client_id: AppID from the WeChat open platform developer console.
         :param client_secret: AppSecret from the WeChat open platform developer console.
+        :param kwargs: Additional options passed to OAuth20Base.
         :return:
         """
         super().__init__(
@@ -26,6 +25,7 @@ class WeChatOpenOAuth20(OAuth20Base):
             refresh_token_endpoint='https://api.weixin.qq.com/sns/oauth2/refresh_token',
             userinfo_endpoint='https://api.weixin.qq.com/sns/userinfo',
             default_scopes=['snsapi_login'],
+            **kwargs,
         )
 
     async def get_authorization_url(
@@ -44,21 +44,33 @@ class WeChatOpenOAuth20(OAuth20Base):
         :param kwargs: Additional query parameters.
         :return:
         """
-        params = {'appid': self.client_id, 'redirect_uri': redirect_uri, 'response_type': 'code', 'lang': 'cn'}
+        params = {}
 
         if state is not None:
             params['state'] = state
 
+        if kwargs:
+            params.update(kwargs)
+
+        return f'{self.build_authorization_url(redirect_uri, scope, params)}#wechat_redirect'
+
+    def get_authorization_params(self, redirect_uri: str, scope: list[str] | None = None) -> dict[str, str]:
+        """
+        Get the static query parameters of the WeChat Open Platform authorization URL.
+
+        :param redirect_uri: The URL where WeChat will redirect after authorization.
+        :param scope: The list of OAuth scopes to request. Default is ['snsapi_login'].
+        :return:
+        """
+        params = {'appid': self.client_id, 'redirect_uri': redirect_uri, 'response_type': 'code', 'lang': 'cn'}
+
         _scope = scope or self.default_scopes
         if _scope is not None:
             params['scope'] = ','.join(_scope)
 
-        if kwargs:
-            params.update(kwargs)
-
-        return f'{self.authorize_endpoint}?{urlencode(params)}#wechat_redirect'
+        return params
 
-    async def get_access_token(self, code: str) -> dict[str, Any]:  # ty:ignore[invalid-method-override]
+    async def get_access_token(self, code: str) -> TokenResponse:  # ty:ignore[invalid-method-override]
         """
         Exchange authorization code for access token using WeChat's GET method.
 
@@ -72,17 +84,19 @@ class WeChatOpenOAuth20(OAuth20Base):
             'grant_type': 'authorization_code',
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.access_token_endpoint,
-                params=params,
-                headers=self.request_headers,
-            )
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=AccessTokenError)
-            return result
-
-    async def refresh_token(self, refresh_token: str) -> dict[str, Any]:
+        response = await self.request(
+            'GET',
+            self.access_token_endpoint,
+            params=params,
+            headers=self.request_headers,
+            idempotent=False,
+            endpoint='access_token',
+        )
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=AccessTokenError)
+        return TokenResponse(result)
+
+    async def _refresh_token(self, refresh_token: str) -> TokenResponse:
         """
         Refresh access token using WeChat's GET method.
 
@@ -98,17 +112,19 @@ class WeChatOpenOAuth20(OAuth20Base):
             'refresh_token': refresh_token,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.refresh_token_endpoint,
-                params=params,
-                headers=self.request_headers,
-            )
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=RefreshTokenError)
-            return result
-
-    async def get_userinfo(self, access_token: str, openid: str | None = None) -> dict[str, Any]:
+        response = await self.request(
+            'GET',
+            self.refresh_token_endpoint,
+            params=params,
+            headers=self.request_headers,
+            idempotent=False,
+            endpoint='refresh_token',
+        )
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=RefreshTokenError)
+        return TokenResponse(result)
+
+    async def get_userinfo(self, access_token: str, openid: str | None = None) -> UserInfo:
         """
         Retrieve user information from WeChat Open Platform API.
 
@@ -125,11 +141,7 @@ class WeChatOpenOAuth20(OAuth20Base):
             'lang': 'zh_CN',
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.userinfo_endpoint,
-                params=params,
-            )
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=GetUserInfoError)
-            return result
+        response = await self.request('GET', self.userinfo_endpoint, params=params, endpoint='userinfo')
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=GetUserInfoError)
+        return UserInfo(result)
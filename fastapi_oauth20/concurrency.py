@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class HostLimit:
+    """Adaptive concurrency state of one provider host."""
+
+    limit: float
+    in_flight: int = 0
+    latencies: dict[str, deque[float]] = field(default_factory=dict)
+    last_decrease: float = 0.0
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limiter per provider host, adjusting its limit by additive increase and multiplicative decrease."""
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff_ratio: float = 0.5,
+        latency_threshold: float | None = None,
+        latency_tolerance: float = 3.0,
+        latency_window: int = 100,
+    ) -> None:
+        """
+        Initialize adaptive concurrency limiter.
+
+        :param initial_limit: In-flight limit of a host before any request completed.
+        :param min_limit: Lowest in-flight limit of a host.
+        :param max_limit: Highest in-flight limit of a host.
+        :param backoff_ratio: Factor the limit is multiplied with when the host shows overload.
+        :param latency_threshold: Seconds from which a response counts as overload, defaults to `latency_tolerance`
+            times the lowest recent latency of the endpoint.
+        :param latency_tolerance: Multiple of the lowest recent latency from which a response counts as overload.
+        :param latency_window: Number of recent latencies per endpoint the lowest latency is taken from, so a single
+            unusually fast response stops counting as the baseline once it left the window.
+        :return:
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = latency_window
+        self._hosts: dict[str, HostLimit] = {}
+
+    def get_limit(self, host: str) -> int:
+        """
+        Get the current in-flight limit of a host.
+
+        :param host: The provider host.
+        :return:
+        """
+        state = self._hosts.get(host)
+        return self.initial_limit if state is None else int(state.limit)
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        """
+        Get the in-flight limit and in-flight requests per host, e.g. for dashboards.
+
+        :return:
+        """
+        return {host: (int(state.limit), state.in_flight) for host, state in self._hosts.items()}
+
+    async def acquire(self, host: str) -> None:
+        """
+        Wait until the host has room for another in-flight request.
+
+        Every acquired request must be followed by `record` or `release`.
+
+        :param host: The provider host.
+        :return:
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostLimit(limit=float(self.initial_limit))
+        if state.in_flight < int(state.limit) and not state.waiters:
+            state.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+            else:
+                # The slot was handed over right before the cancellation, pass it on
+                self.release(host)
+            raise
+
+    def release(self, host: str) -> None:
+        """
+        Release an in-flight request without an outcome, e.g. cancelled.
+
+        :param host: The provider host.
+        :return:
+        """
+        state = self._hosts[host]
+        state.in_flight -= 1
+        while state.waiters and state.in_flight < int(state.limit):
+            waiter = state.waiters.popleft()
+            if not waiter.done():
+                state.in_flight += 1
+                waiter.set_result(None)
+
+    def record(self, host: str, *, overloaded: bool, duration: float | None, endpoint: str = '') -> None:
+        """
+        Record the outcome of an in-flight request, adjust the limit of the host and release the request.
+
+        :param host: The provider host.
+        :param overloaded: Whether the host rejected the request, e.g. with a 429 or 5xx response or a transport error.
+        :param duration: Duration of the request in seconds, or None if its latency says nothing about the load of the
+            host, e.g. a 4xx response answered before any real work.
+        :param endpoint: The endpoint of the host the request was sent to, e.g. the URL path, endpoints of one host
+            are compared against their own latency baseline.
+        :return:
+        """
+        state = self._hosts[host]
+        now = time.monotonic()
+        if not overloaded and duration is not None:
+            latencies = state.latencies.get(endpoint)
+            if latencies is None:
+                latencies = state.latencies[endpoint] = deque(maxlen=self.latency_window)
+            latencies.append(duration)
+            threshold = self.latency_threshold
+            if threshold is None:
+                threshold = min(latencies) * self.latency_tolerance
+            overloaded = duration > threshold
+
+        if overloaded:
+            # Requests sent before the last decrease saw the old limit, let them not decrease it again
+            if now - (duration or 0.0) >= state.last_decrease:
+                state.limit = max(state.limit * self.backoff_ratio, float(self.min_limit))
+                state.last_decrease = now
+        else:
+            # Grows the limit by about one per round trip of a full window
+            state.limit = min(state.limit + 1 / state.limit, float(self.max_limit))
+        self.release(host)
@@ -0,0 +1,66 @@
+import time
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+_deadline: ContextVar[float | None] = ContextVar('fastapi_oauth20_deadline', default=None)
+
+
+def current_deadline() -> float | None:
+    """
+    Get the deadline of the current context as a `time.monotonic` timestamp, None if not set.
+
+    :return:
+    """
+    return _deadline.get()
+
+
+def remaining_time() -> float | None:
+    """
+    Get the seconds left until the deadline of the current context, None if not set.
+
+    :return:
+    """
+    deadline_at = _deadline.get()
+    return None if deadline_at is None else deadline_at - time.monotonic()
+
+
+@contextmanager
+def deadline(timeout: float | None = None, *, at: float | None = None) -> Generator[float | None, None, None]:
+    """
+    Bound all provider requests made within the block by a deadline, each request gets only the remaining time.
+
+    A deadline set by an outer block is never extended.
+
+    :param timeout: Seconds from now until the deadline.
+    :param at: The deadline as a `time.monotonic` timestamp, e.g. `request.state.oauth20_deadline`.
+    :return:
+    """
+    candidates = [value for value in (_deadline.get(), at) if value is not None]
+    if timeout is not None:
+        candidates.append(time.monotonic() + timeout)
+    deadline_at = min(candidates, default=None)
+    token = _deadline.set(deadline_at)
+    try:
+        yield deadline_at
+    finally:
+        _deadline.reset(token)
+
+
+def cap_timeout(timeout: httpx.Timeout, remaining: float) -> httpx.Timeout:
+    """
+    Cap every phase of an httpx timeout to the remaining time.
+
+    :param timeout: The configured timeout.
+    :param remaining: Seconds left until the deadline.
+    :return:
+    """
+    return httpx.Timeout(
+        connect=remaining if timeout.connect is None else min(timeout.connect, remaining),
+        read=remaining if timeout.read is None else min(timeout.read, remaining),
+        write=remaining if timeout.write is None else min(timeout.write, remaining),
+        pool=remaining if timeout.pool is None else min(timeout.pool, remaining),
+    )
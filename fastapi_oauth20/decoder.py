@@ -0,0 +1,32 @@
+import importlib
+import importlib.util
+import json
+
+from collections.abc import Callable
+from typing import Any
+
+
+def _get_decoder() -> tuple[str, Callable[[bytes], Any], tuple[type[Exception], ...]]:
+    # Prefer the fastest installed decoder, all of them decode the response bytes without an intermediate str
+    if importlib.util.find_spec('orjson') is not None:
+        orjson = importlib.import_module('orjson')
+        return 'orjson', orjson.loads, (orjson.JSONDecodeError,)
+    if importlib.util.find_spec('msgspec') is not None:
+        msgspec = importlib.import_module('msgspec')
+        return 'msgspec', msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+    return 'json', json.loads, (json.JSONDecodeError, UnicodeDecodeError)
+
+
+JSON_DECODER, _loads, DECODE_ERRORS = _get_decoder()
+
+
+def loads(content: bytes) -> Any:
+    """
+    Decode a JSON document from bytes with orjson or msgspec when installed, falling back to the standard library.
+
+    Invalid documents raise one of `DECODE_ERRORS`.
+
+    :param content: The raw response body.
+    :return:
+    """
+    return _loads(content)
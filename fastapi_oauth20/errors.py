@@ -66,3 +66,51 @@ class RedirectURIError(OAuth20RequestError):
     """Exception raised for redirect URI configuration errors."""
 
     pass
+
+
+class RateLimitExceededError(OAuth20RequestError):
+    """Exception raised when a request is rejected client-side because the provider rate limit is exhausted."""
+
+    def __init__(self, msg: str, response: httpx.Response | None = None, retry_after: float | None = None) -> None:
+        """
+        Initialize rate limit exceeded error.
+
+        :param msg: Human-readable error message describing the rate limit.
+        :param response: The HTTP response that exhausted the rate limit (if available).
+        :param retry_after: Seconds until the rate limit is expected to allow requests again.
+        :return:
+        """
+        self.retry_after = retry_after
+        super().__init__(msg, response)
+
+
+class CircuitOpenError(OAuth20RequestError):
+    """Exception raised when a request fails fast because the circuit of the provider endpoint is open."""
+
+    def __init__(self, msg: str, response: httpx.Response | None = None, retry_after: float | None = None) -> None:
+        """
+        Initialize circuit open error.
+
+        :param msg: Human-readable error message describing the open circuit.
+        :param response: Always None, no request is sent while the circuit is open.
+        :param retry_after: Seconds until the circuit lets probe requests through again.
+        :return:
+        """
+        self.retry_after = retry_after
+        super().__init__(msg, response)
+
+
+class DeadlineExceededError(OAuth20RequestError):
+    """Exception raised when a request cannot complete before the deadline of the current context."""
+
+    pass
+
+
+class ResponseTooLargeError(OAuth20RequestError):
+    """
+    Exception raised when a provider response body exceeds the maximum response size of the client.
+
+    The attached response is closed without its body, reading `response.content` raises `httpx.ResponseNotRead`.
+    """
+
+    pass
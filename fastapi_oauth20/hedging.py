@@ -0,0 +1,135 @@
+import asyncio
+import math
+import time
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from typing import TypeVar
+
+_T = TypeVar('_T')
+
+
+@dataclass
+class HedgingStats:
+    """Counters of a hedger."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+class Hedger:
+    """Send a second, hedged request when the first one is slower than a latency percentile of the endpoint."""
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.95,
+        window_size: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.01,
+        initial_delay: float | None = None,
+        budget_ratio: float = 0.1,
+        max_budget: float = 10.0,
+    ) -> None:
+        """
+        Initialize hedger.
+
+        :param percentile: Latency percentile of the endpoint after which the hedged request is sent, e.g. 0.95.
+        :param window_size: Number of most recent latencies per endpoint the percentile is computed over.
+        :param min_samples: Minimum number of latencies before the percentile is used.
+        :param min_delay: Lowest delay in seconds before a hedged request is sent.
+        :param initial_delay: Delay in seconds used until enough latencies were observed, None does not hedge then.
+        :param budget_ratio: Hedged requests allowed per request, e.g. 0.1 caps the extra load at 10%.
+        :param max_budget: Maximum number of hedged requests saved up while the endpoint is fast.
+        :return:
+        """
+        self.percentile = percentile
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self._stats = HedgingStats()
+        self._latencies: dict[str, deque[float]] = {}
+        self._budget = max_budget
+
+    def stats(self) -> HedgingStats:
+        """
+        Get the number of requests, hedged requests and requests won by the hedged request.
+
+        :return:
+        """
+        return replace(self._stats)
+
+    def get_delay(self, key: str) -> float | None:
+        """
+        Get the delay after which a request to an endpoint is hedged, None if it is not hedged.
+
+        :param key: The endpoint key, the URL.
+        :return:
+        """
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(latencies)
+        index = min(math.ceil(self.percentile * len(ordered)) - 1, len(ordered) - 1)
+        return max(ordered[max(index, 0)], self.min_delay)
+
+    def record(self, key: str, latency: float) -> None:
+        """
+        Record the latency of a successful request to an endpoint.
+
+        :param key: The endpoint key, the URL.
+        :param latency: The latency in seconds.
+        :return:
+        """
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = deque(maxlen=self.window_size)
+        latencies.append(latency)
+
+    async def run(self, key: str, func: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        Run a request, hedging it with a second identical request if it is slower than the endpoint percentile.
+
+        The first successful request wins and the other one is cancelled, an error is raised only if both fail.
+
+        :param key: The endpoint key, the URL.
+        :param func: Function sending the request, called once more for the hedged request.
+        :return:
+        """
+        self._stats.requests += 1
+        self._budget = min(self._budget + self.budget_ratio, self.max_budget)
+        delay = self.get_delay(key)
+
+        primary = asyncio.ensure_future(func())
+        starts = {primary: time.monotonic()}
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+                if not primary.done() and self._budget >= 1:
+                    self._budget -= 1
+                    self._stats.hedged += 1
+                    starts[asyncio.ensure_future(func())] = time.monotonic()
+
+            pending = set(starts)
+            errors: list[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exception = task.exception()
+                    if exception is not None:
+                        errors.append(exception)
+                        continue
+                    self.record(key, time.monotonic() - starts[task])
+                    if task is not primary:
+                        self._stats.hedge_wins += 1
+                    return task.result()
+            raise errors[0]
+        finally:
+            # The losing request is slow by definition, giving up its connection is cheaper than waiting for it
+            for task in starts:
+                task.cancel()
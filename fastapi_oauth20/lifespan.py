@@ -0,0 +1,56 @@
+import asyncio
+
+from collections.abc import AsyncGenerator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from fastapi import FastAPI
+
+from fastapi_oauth20.errors import OAuth20BaseError
+from fastapi_oauth20.oauth20 import OAuth20Base
+
+
+async def warmup_clients(*clients: OAuth20Base, raise_on_error: bool = True) -> dict[str, float]:
+    """
+    Warm up the connection pools of several OAuth2 clients concurrently.
+
+    :param clients: The OAuth2 clients to warm up.
+    :param raise_on_error: Whether to raise the first warmup error, otherwise endpoints that failed are left out.
+    :return:
+    """
+    results = await asyncio.gather(*(client.warmup() for client in clients), return_exceptions=True)
+    timings: dict[str, float] = {}
+    for result in results:
+        if isinstance(result, BaseException):
+            if raise_on_error or not isinstance(result, OAuth20BaseError):
+                raise result
+            continue
+        timings.update(result)
+    return timings
+
+
+def oauth20_lifespan(
+    *clients: OAuth20Base,
+    raise_on_error: bool = True,
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """
+    Create a FastAPI lifespan that warms up OAuth2 clients on startup and closes them on shutdown.
+
+    The warmup round-trip timings per endpoint are stored in `app.state.oauth20_warmup`, e.g. for readiness probes.
+
+    :param clients: The OAuth2 clients registered in the application.
+    :param raise_on_error: Whether a failed warmup aborts the application startup.
+    :return:
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+        app.state.oauth20_warmup = await warmup_clients(*clients, raise_on_error=raise_on_error)
+        try:
+            yield
+        finally:
+            for client in clients:
+                await client.aclose()
+            for registry in {id(client.transport_registry): client.transport_registry for client in clients}.values():
+                await registry.aclose()
+
+    return lifespan
@@ -1,21 +1,51 @@
-import json
-
-from typing import Any, Literal, cast
+import asyncio
+import base64
+import hashlib
+import time
+import warnings
+
+from collections.abc import Mapping
+from types import TracebackType
+from typing import Any, Literal, TypeVar, cast
 from urllib.parse import urlencode
 
 import httpx
 
+from fastapi_oauth20 import decoder
+from fastapi_oauth20.cache import LRUCache
+from fastapi_oauth20.circuitbreaker import CircuitBreaker
+from fastapi_oauth20.concurrency import AdaptiveConcurrencyLimiter
+from fastapi_oauth20.deadline import cap_timeout, remaining_time
 from fastapi_oauth20.errors import (
     AccessTokenError,
+    DeadlineExceededError,
     GetUserInfoError,
     HTTPXOAuth20Error,
     OAuth20RequestError,
     RefreshTokenError,
+    ResponseTooLargeError,
     RevokeTokenError,
 )
+from fastapi_oauth20.hedging import Hedger
+from fastapi_oauth20.ratelimit import RateLimitTracker, TokenBucketLimiter
+from fastapi_oauth20.results import TokenResponse, UserInfo
+from fastapi_oauth20.retry import RetryPolicy
+from fastapi_oauth20.scheduler import RequestScheduler, current_priority, priority
+from fastapi_oauth20.singleflight import SingleFlight
+from fastapi_oauth20.transport import (
+    SharedTransport,
+    TransportRegistry,
+    default_transport_registry,
+    is_http2_available,
+)
+
+_OAuth20T = TypeVar('_OAuth20T', bound='OAuth20Base')
 
 
 class OAuth20Base:
+    TIMEOUT_ENDPOINTS = ('access_token', 'refresh_token', 'revoke_token', 'userinfo')
+    AUTHORIZATION_URL_CACHE_SIZE = 128
+
     def __init__(
         self,
         client_id: str,
@@ -29,6 +59,18 @@ class OAuth20Base:
         default_scopes: list[str] | None = None,
         token_endpoint_basic_auth: bool = False,
         revoke_token_endpoint_basic_auth: bool = False,
+        transport_registry: TransportRegistry | None = None,
+        http2: bool = False,
+        refresh_share_window: float = 0.0,
+        rate_limit_tracker: RateLimitTracker | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
+        scheduler: RequestScheduler | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        timeouts: Mapping[str, httpx.Timeout | float] | None = None,
+        hedger: Hedger | None = None,
+        max_response_size: int | None = None,
     ):
         """
         Base OAuth2 client implementing the OAuth 2.0 authorization framework.
@@ -43,6 +85,24 @@ class OAuth20Base:
         :param default_scopes: Default list of OAuth scopes to request if none are specified.
         :param token_endpoint_basic_auth: Whether to use HTTP Basic Authentication for token endpoint requests.
         :param revoke_token_endpoint_basic_auth: Whether to use HTTP Basic Authentication for revoke endpoint requests.
+        :param transport_registry: Registry of connection pools shared per provider host, defaults to the global one.
+        :param http2: Whether to negotiate HTTP/2 with the provider, falls back to HTTP/1.1 if `h2` is not installed.
+        :param refresh_share_window: Seconds a refreshed token is shared with later calls of the same refresh token.
+        :param rate_limit_tracker: Tracker of the rate limit headers sent by the provider, holds requests back or fails
+            them fast once the budget of the app or token is exhausted.
+        :param retry_policy: Policy retrying transient failures of idempotent requests, None disables retries.
+        :param circuit_breaker: Circuit breaker per provider endpoint, failing requests fast while the endpoint is down.
+        :param rate_limiter: Client-side token bucket limiting the request rate, share one between clients of the same
+            app with `TokenBucketLimiter.shared(client_id, ...)`.
+        :param scheduler: Scheduler admitting requests by priority class, so that interactive logins get request slots
+            and rate limit tokens before refresh and batch work.
+        :param concurrency_limiter: Limiter adapting the number of in-flight requests per provider host to its observed
+            latency and errors.
+        :param timeouts: Timeouts per endpoint, keyed by `access_token`, `refresh_token`, `revoke_token` or `userinfo`,
+            other requests use the httpx default timeout.
+        :param hedger: Hedger of userinfo requests, sends a second request when the first one is slower than usual.
+        :param max_response_size: Maximum size in bytes of a decoded provider response body, e.g. of the token or
+            userinfo endpoint, larger bodies are aborted while streaming. None reads bodies of any size.
         :return:
         """
         self.client_id = client_id
@@ -55,11 +115,308 @@ class OAuth20Base:
         self.default_scopes = default_scopes
         self.token_endpoint_basic_auth = token_endpoint_basic_auth
         self.revoke_token_endpoint_basic_auth = revoke_token_endpoint_basic_auth
+        self.transport_registry = transport_registry or default_transport_registry
+
+        if http2 and not is_http2_available():
+            warnings.warn(
+                'HTTP/2 requires the h2 package, install it with `pip install httpx[http2]`; falling back to HTTP/1.1',
+                stacklevel=2,
+            )
+            http2 = False
+        self.http2 = http2
+
+        self._refresh_flight: SingleFlight[TokenResponse] = SingleFlight(refresh_share_window)
+        self.rate_limit_tracker = rate_limit_tracker
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.concurrency_limiter = concurrency_limiter
+        self.hedger = hedger
+        self.max_response_size = max_response_size
+        self.timeouts: dict[str, httpx.Timeout] = {}
+        for name, timeout in (timeouts or {}).items():
+            # Keyed by endpoint name, providers such as Google share one URL between token exchange and refresh
+            if name not in self.TIMEOUT_ENDPOINTS or getattr(self, f'{name}_endpoint', None) is None:
+                raise ValueError(f'Invalid timeout endpoint: {name}')
+            self.timeouts[name] = timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout)
 
         self.request_headers = {
             'Accept': 'application/json',
         }
 
+        self._client_credentials: tuple[str, str, str, str] | None = None
+
+        self._http_client: httpx.AsyncClient | None = None
+        self._authorization_queries: LRUCache[tuple[str, frozenset[str]]] = LRUCache(
+            maxsize=self.AUTHORIZATION_URL_CACHE_SIZE
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        The pooled HTTP client shared by all requests of this OAuth2 client.
+
+        The client is created lazily on first use and sends requests through the connection pools of the transport
+        registry, so all clients talking to the same provider host share keep-alive connections.
+
+        :return:
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self.create_http_client()
+        return self._http_client
+
+    def create_http_client(self) -> httpx.AsyncClient:
+        """
+        Create the pooled HTTP client used by this OAuth2 client, override to customize it.
+
+        :return:
+        """
+        return httpx.AsyncClient(transport=SharedTransport(self.transport_registry, http2=self.http2))
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP client, the shared connection pools stay open for other clients.
+
+        :return:
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def __aenter__(self: _OAuth20T) -> _OAuth20T:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def warmup(self) -> dict[str, float]:
+        """
+        Open keep-alive connections to the access token and userinfo endpoints ahead of the first login.
+
+        Each endpoint receives a HEAD request so that DNS resolution, TCP connect and TLS handshake happen now, the
+        response status is ignored. The requests go straight through the HTTP client, they are not retried and do not
+        count against rate limits, concurrency limits or circuit breakers. Returns the round-trip seconds of the
+        warmup request per endpoint, including the connection setup.
+
+        :return:
+        """
+        endpoints = list(dict.fromkeys([self.access_token_endpoint, self.userinfo_endpoint]))
+
+        async def connect(endpoint: str) -> float:
+            start = time.perf_counter()
+            try:
+                await self.http_client.request('HEAD', endpoint)
+            except httpx.HTTPError as e:
+                raise HTTPXOAuth20Error(f'Warmup of {endpoint} failed: {e}') from e
+            return time.perf_counter() - start
+
+        timings = await asyncio.gather(*(connect(endpoint) for endpoint in endpoints))
+        return dict(zip(endpoints, timings))
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        idempotent: bool | None = None,
+        endpoint: str | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send an HTTP request to the OAuth2 provider through the pooled HTTP client.
+
+        Transient failures are retried according to the retry policy when the request is idempotent.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param idempotent: Whether the request is safe to repeat, defaults to whether the retry policy allows the
+            method. Requests consuming single-use credentials such as authorization codes must pass False.
+        :param endpoint: The endpoint name the request belongs to, one of `TIMEOUT_ENDPOINTS`, selecting its timeout.
+        :param kwargs: Additional arguments passed to `httpx.AsyncClient.request`.
+        :return:
+        """
+        if 'timeout' not in kwargs and endpoint in self.timeouts:
+            kwargs['timeout'] = self.timeouts[endpoint]
+
+        remaining = remaining_time()
+        if remaining is None:
+            return await self._send_hedged(method, url, idempotent, **kwargs)
+        if remaining <= 0:
+            raise DeadlineExceededError(f'Deadline exceeded before {method} {url}')
+
+        timeout = kwargs.get('timeout', self.http_client.timeout)
+        kwargs['timeout'] = cap_timeout(
+            timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout), remaining
+        )
+        try:
+            return await asyncio.wait_for(self._send_hedged(method, url, idempotent, **kwargs), remaining)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceededError(f'Deadline exceeded during {method} {url}') from e
+        except httpx.TimeoutException as e:
+            # The httpx timeout was capped to the deadline, report it as such when it was the limiting factor
+            if (remaining_time() or 0) <= 0.01:
+                raise DeadlineExceededError(f'Deadline exceeded during {method} {url}') from e
+            raise
+
+    async def _send_hedged(
+        self, method: str, url: str, idempotent: bool | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        hedger = self.hedger
+        # Only userinfo requests are read-only and cheap enough to send twice
+        if hedger is None or method != 'GET' or url != self.userinfo_endpoint:
+            return await self._send_with_retry(method, url, idempotent, **kwargs)
+        return await hedger.run(url, lambda: self._send_with_retry(method, url, idempotent, **kwargs))
+
+    async def _send_with_retry(
+        self, method: str, url: str, idempotent: bool | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        policy = self.retry_policy
+        if policy is None or not policy.is_retryable(method, idempotent):
+            return await self._send(method, url, **kwargs)
+
+        attempt = 1
+        while True:
+            try:
+                response = await self._send(method, url, **kwargs)
+            except httpx.TransportError:
+                delay = policy.get_delay(attempt)
+                if delay is None or not self._within_deadline(delay):
+                    raise
+            else:
+                delay = policy.get_delay(attempt, response)
+                if delay is None or not self._within_deadline(delay):
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _within_deadline(delay: float) -> bool:
+        # Retrying is pointless when waiting alone outlasts the deadline
+        remaining = remaining_time()
+        return remaining is None or delay < remaining
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if self.circuit_breaker is not None:
+            # Fail fast on an open circuit before waiting for a slot or taking a rate limit token
+            self.circuit_breaker.check(url)
+
+        scheduler = self.scheduler
+        if scheduler is None:
+            return await self._send_limited(method, url, **kwargs)
+
+        # Requests without an explicit priority class come from user-facing code
+        async with scheduler.slot(current_priority() or 'interactive'):
+            return await self._send_limited(method, url, **kwargs)
+
+    async def _send_limited(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return await self._send_guarded(method, url, **kwargs)
+
+        target = httpx.URL(url)
+        host = target.host
+        await limiter.acquire(host)
+        start = time.perf_counter()
+        try:
+            response = await self._send_guarded(method, url, **kwargs)
+        except httpx.TransportError:
+            limiter.record(host, overloaded=True, duration=time.perf_counter() - start)
+            raise
+        except BaseException:
+            limiter.release(host)
+            raise
+        overloaded = response.status_code == 429 or response.status_code >= 500
+        # Only successful responses did the full work of the endpoint, errors are often answered much faster
+        duration = time.perf_counter() - start if response.is_success or overloaded else None
+        limiter.record(host, overloaded=overloaded, duration=duration, endpoint=target.path)
+        return response
+
+    async def _send_guarded(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return await self._send_tracked(method, url, **kwargs)
+
+        generation = breaker.acquire(url)
+        start = time.perf_counter()
+        try:
+            response = await self._send_tracked(method, url, **kwargs)
+        except httpx.TransportError:
+            breaker.record(url, generation, failed=True, duration=time.perf_counter() - start)
+            raise
+        except BaseException:
+            breaker.release(url, generation)
+            raise
+        breaker.record(url, generation, failed=response.status_code >= 500, duration=time.perf_counter() - start)
+        return response
+
+    async def _send_tracked(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        tracker = self.rate_limit_tracker
+        if tracker is None:
+            return await self._send_bounded(method, url, **kwargs)
+
+        app_key = f'app:{self.client_id}'
+        authorization = (kwargs.get('headers') or {}).get('Authorization', '')
+        # Requests on behalf of a user count against the budget of their token, requests authenticated with the
+        # client credentials against the app. Unauthenticated requests such as warmups are limited per IP by the
+        # provider, their budget says nothing about the app and must not block logins.
+        # A user request is still held back while the app is blocked, but only its token budget is deducted, since
+        # its response updates that budget alone.
+        if authorization.startswith('Bearer '):
+            key = f'token:{hashlib.sha256(authorization.encode()).hexdigest()}'
+            await tracker.acquire(key, app_key)
+        elif self.uses_client_credentials(kwargs):
+            key = app_key
+            await tracker.acquire(key)
+        else:
+            return await self._send_bounded(method, url, **kwargs)
+        response = await self._send_bounded(method, url, **kwargs)
+        tracker.update(key, response)
+        return response
+
+    async def _send_bounded(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        limit = self.max_response_size
+        if limit is None:
+            return await self.http_client.request(method, url, **kwargs)
+
+        async with self.http_client.stream(method, url, **kwargs) as response:
+            content_length = response.headers.get('Content-Length', '')
+            if content_length.isdigit() and int(content_length) > limit:
+                raise ResponseTooLargeError(
+                    f'Response of {method} {url} exceeds {limit} bytes: Content-Length {content_length}', response
+                )
+            chunks: list[bytes] = []
+            size = 0
+            # Decoded chunks are counted, so that a small compressed body cannot expand beyond the limit
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > limit:
+                    raise ResponseTooLargeError(f'Response of {method} {url} exceeds {limit} bytes', response)
+                chunks.append(chunk)
+        # The body is already decoded, so the new response must not decode it again or announce the wire size
+        headers = response.headers.copy()
+        for name in ('Content-Encoding', 'Content-Length', 'Transfer-Encoding'):
+            headers.pop(name, None)
+        bounded = httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=b''.join(chunks),
+            request=response.request,
+            extensions=response.extensions,
+            history=response.history,
+            default_encoding=response.default_encoding,
+        )
+        bounded.elapsed = response.elapsed
+        return bounded
+
     async def get_authorization_url(
         self,
         redirect_uri: str,
@@ -80,19 +437,11 @@ class OAuth20Base:
         :param kwargs: Additional query parameters to include in the authorization URL.
         :return:
         """
-        params = {
-            'client_id': self.client_id,
-            'redirect_uri': redirect_uri,
-            'response_type': 'code',
-        }
+        params = {}
 
         if state is not None:
             params['state'] = state
 
-        _scope = scope or self.default_scopes
-        if _scope is not None:
-            params['scope'] = ' '.join(_scope)
-
         if code_challenge is not None:
             params['code_challenge'] = code_challenge
 
@@ -102,9 +451,56 @@ class OAuth20Base:
         if kwargs:
             params.update(kwargs)
 
-        return f'{self.authorize_endpoint}?{urlencode(params)}'
+        return self.build_authorization_url(redirect_uri, scope, params)
+
+    def get_authorization_params(self, redirect_uri: str, scope: list[str] | None = None) -> dict[str, str]:
+        """
+        Get the query parameters of the authorization URL that are the same for every login with a redirect URI and
+        scope, override for providers with different parameter names.
+
+        :param redirect_uri: The URL where the OAuth2 provider will redirect after authorization.
+        :param scope: The list of OAuth scopes to request. If None, uses default_scopes from initialization.
+        :return:
+        """
+        params = {
+            'client_id': self.client_id,
+            'redirect_uri': redirect_uri,
+            'response_type': 'code',
+        }
+
+        _scope = scope or self.default_scopes
+        if _scope is not None:
+            params['scope'] = ' '.join(_scope)
+
+        return params
+
+    def build_authorization_url(self, redirect_uri: str, scope: list[str] | None, params: dict[str, Any]) -> str:
+        """
+        Build the authorization URL from the precompiled static query and the per-request parameters.
+
+        The static query is encoded once per redirect URI and scope and kept in a bounded cache.
 
-    async def get_access_token(self, code: str, redirect_uri: str, code_verifier: str | None = None) -> dict[str, Any]:
+        :param redirect_uri: The URL where the OAuth2 provider will redirect after authorization.
+        :param scope: The list of OAuth scopes to request. If None, uses default_scopes from initialization.
+        :param params: The per-request query parameters, e.g. state and PKCE code challenge.
+        :return:
+        """
+        key = (redirect_uri, tuple(scope) if scope else None)
+        cached = self._authorization_queries.get(key)
+        if cached is None:
+            static_params = self.get_authorization_params(redirect_uri, scope)
+            cached = (urlencode(static_params), frozenset(static_params))
+            self._authorization_queries.set(key, cached)
+
+        query, static_keys = cached
+        if not static_keys.isdisjoint(params):
+            # Per-request parameters overriding static ones take their place in the query
+            query = urlencode({**self.get_authorization_params(redirect_uri, scope), **params})
+        elif params:
+            query = f'{query}&{urlencode(params)}'
+        return f'{self.authorize_endpoint}?{query}'
+
+    async def get_access_token(self, code: str, redirect_uri: str, code_verifier: str | None = None) -> TokenResponse:
         """
         Exchange authorization code for access token.
 
@@ -119,29 +515,42 @@ class OAuth20Base:
             'grant_type': 'authorization_code',
         }
 
-        auth = None
-        if not self.token_endpoint_basic_auth:
-            data.update({'client_id': self.client_id, 'client_secret': self.client_secret})
-        else:
-            auth = httpx.BasicAuth(self.client_id, self.client_secret)
-
         if code_verifier:
             data.update({'code_verifier': code_verifier})
 
-        async with httpx.AsyncClient(auth=auth) as client:
-            response = await client.post(
-                self.access_token_endpoint,
-                data=data,
-                headers=self.request_headers,
-            )
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=AccessTokenError)
-            return result
-
-    async def refresh_token(self, refresh_token: str) -> dict[str, Any]:
+        response = await self.request(
+            'POST',
+            self.access_token_endpoint,
+            **self.build_form_request(data, basic_auth=self.token_endpoint_basic_auth),
+            idempotent=False,
+            endpoint='access_token',
+        )
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=AccessTokenError)
+        return TokenResponse(result)
+
+    async def refresh_token(self, refresh_token: str) -> TokenResponse:
         """
         Refresh an access token using a refresh token.
 
+        Concurrent calls with the same refresh token are deduplicated: a single request is sent to the provider and
+        every caller receives its result, which matters for providers rotating refresh tokens on each use. The request
+        is scheduled with the `refresh` priority class unless the caller set one.
+
+        :param refresh_token: The refresh token received from the initial token exchange.
+        :return:
+        """
+        if self.refresh_token_endpoint is None:
+            raise RefreshTokenError('The refresh token address is missing')
+
+        with priority(current_priority() or 'refresh'):
+            result = await self._refresh_flight.do(refresh_token, lambda: self._refresh_token(refresh_token))
+        return TokenResponse(result, issued_at=getattr(result, 'issued_at', None))
+
+    async def _refresh_token(self, refresh_token: str) -> TokenResponse:
+        """
+        Send the refresh token request to the provider, override for providers with a non-standard refresh flow.
+
         :param refresh_token: The refresh token received from the initial token exchange.
         :return:
         """
@@ -153,21 +562,16 @@ class OAuth20Base:
             'grant_type': 'refresh_token',
         }
 
-        auth = None
-        if not self.token_endpoint_basic_auth:
-            data.update({'client_id': self.client_id, 'client_secret': self.client_secret})
-        else:
-            auth = httpx.BasicAuth(self.client_id, self.client_secret)
-
-        async with httpx.AsyncClient(auth=auth) as client:
-            response = await client.post(
-                self.refresh_token_endpoint,
-                data=data,
-                headers=self.request_headers,
-            )
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=RefreshTokenError)
-            return result
+        response = await self.request(
+            'POST',
+            self.refresh_token_endpoint,
+            **self.build_form_request(data, basic_auth=self.token_endpoint_basic_auth),
+            idempotent=False,
+            endpoint='refresh_token',
+        )
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=RefreshTokenError)
+        return TokenResponse(result)
 
     async def revoke_token(self, token: str, token_type_hint: str | None = None) -> None:
         """
@@ -185,19 +589,62 @@ class OAuth20Base:
         if token_type_hint is not None:
             data.update({'token_type_hint': token_type_hint})
 
-        auth = None
-        if not self.revoke_token_endpoint_basic_auth:
-            data.update({'client_id': self.client_id, 'client_secret': self.client_secret})
-        else:
-            auth = httpx.BasicAuth(self.client_id, self.client_secret)
+        response = await self.request(
+            'POST',
+            self.revoke_token_endpoint,
+            **self.build_form_request(data, basic_auth=self.revoke_token_endpoint_basic_auth),
+            idempotent=True,
+            endpoint='revoke_token',
+        )
+        self.raise_httpx_oauth20_errors(response)
+
+    def _get_client_credentials(self) -> tuple[str, str]:
+        # Encoded once instead of on every token request, and again only after the credentials were changed, e.g.
+        # while rotating the client secret
+        cached = self._client_credentials
+        if cached is None or cached[:2] != (self.client_id, self.client_secret):
+            form = urlencode({'client_id': self.client_id, 'client_secret': self.client_secret})
+            credentials = base64.b64encode(f'{self.client_id}:{self.client_secret}'.encode()).decode()
+            cached = self._client_credentials = (self.client_id, self.client_secret, form, f'Basic {credentials}')
+        return cached[2], cached[3]
+
+    def uses_client_credentials(self, kwargs: Mapping[str, Any]) -> bool:
+        """
+        Check whether a request is authenticated with the client credentials, e.g. a token endpoint request.
 
-        async with httpx.AsyncClient(auth=auth) as client:
-            response = await client.post(
-                self.revoke_token_endpoint,
-                data=data,
-                headers=self.request_headers,
-            )
-            self.raise_httpx_oauth20_errors(response)
+        :param kwargs: The arguments of the request, as passed to `request`.
+        :return:
+        """
+        form, basic_auth_header = self._get_client_credentials()
+        headers = kwargs.get('headers') or {}
+        if headers.get('Authorization') == basic_auth_header:
+            return True
+        content = kwargs.get('content')
+        if isinstance(content, bytes) and content.endswith(form.encode()):
+            return True
+        # WeChat identifies the app by the appid query parameter
+        params = kwargs.get('params')
+        return isinstance(params, Mapping) and params.get('appid') == self.client_id
+
+    def build_form_request(self, data: dict[str, str], *, basic_auth: bool) -> dict[str, Any]:
+        """
+        Build the body and headers of a form request to a token endpoint, authenticated with the client credentials.
+
+        Only the per-request fields are encoded, the current client credentials are appended as a cached form fragment
+        or sent as a cached HTTP Basic Authorization header.
+
+        :param data: The per-request form fields.
+        :param basic_auth: Whether to authenticate with HTTP Basic Authentication instead of form fields.
+        :return:
+        """
+        form, basic_auth_header = self._get_client_credentials()
+        headers = {**self.request_headers, 'Content-Type': 'application/x-www-form-urlencoded'}
+        body = urlencode(data)
+        if basic_auth:
+            headers['Authorization'] = basic_auth_header
+        else:
+            body = f'{body}&{form}' if body else form
+        return {'content': body.encode(), 'headers': headers}
 
     @staticmethod
     def raise_httpx_oauth20_errors(response: httpx.Response) -> None:
@@ -219,16 +666,18 @@ class OAuth20Base:
         """
         Parse JSON response and handle JSON decoding errors.
 
+        The body is decoded with orjson or msgspec when installed, see `fastapi_oauth20.decoder`.
+
         :param response: The HTTP response object containing JSON data.
         :param err_class: The specific OAuth2RequestError subclass to raise on JSON parsing failure.
         :return:
         """
         try:
-            return cast(dict[str, Any], response.json())
-        except json.JSONDecodeError as e:
+            return cast(dict[str, Any], decoder.loads(response.content))
+        except decoder.DECODE_ERRORS as e:
             raise err_class('Result serialization failed.', response) from e
 
-    async def get_userinfo(self, access_token: str) -> dict[str, Any]:
+    async def get_userinfo(self, access_token: str) -> UserInfo:
         """
         Retrieve user information from the OAuth2 provider.
 
@@ -236,8 +685,7 @@ class OAuth20Base:
         :return:
         """
         headers = {'Authorization': f'Bearer {access_token}'}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.userinfo_endpoint, headers=headers)
-            self.raise_httpx_oauth20_errors(response)
-            result = self.get_json_result(response, err_class=GetUserInfoError)
-            return result
+        response = await self.request('GET', self.userinfo_endpoint, headers=headers, endpoint='userinfo')
+        self.raise_httpx_oauth20_errors(response)
+        result = self.get_json_result(response, err_class=GetUserInfoError)
+        return UserInfo(result)
@@ -0,0 +1,266 @@
+import asyncio
+import time
+
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import ClassVar, Literal
+
+import httpx
+
+from fastapi_oauth20.cache import LRUCache
+from fastapi_oauth20.errors import RateLimitExceededError
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """
+    Parse a `Retry-After` header, given in seconds or as an HTTP date, into seconds to wait.
+
+    :param value: The header value.
+    :param now: The current UNIX timestamp, defaults to now.
+    :return:
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - (time.time() if now is None else now), 0.0)
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return None if value is None else int(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitBudget:
+    """Rate limit budget reported by a provider, timestamps are UNIX timestamps."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    retry_at: float | None = None
+
+    def blocked_until(self, min_remaining: int = 0, now: float | None = None) -> float | None:
+        """
+        Get the time until which requests should not be sent, None if the budget allows requests.
+
+        :param min_remaining: Number of requests kept in reserve, the budget is exhausted at or below it.
+        :param now: The current UNIX timestamp, defaults to now.
+        :return:
+        """
+        now = time.time() if now is None else now
+        until = None
+        if self.retry_at is not None and self.retry_at > now:
+            until = self.retry_at
+        if (
+            self.remaining is not None
+            and self.remaining <= min_remaining
+            and self.reset_at is not None
+            and self.reset_at > now
+        ):
+            until = self.reset_at if until is None else max(until, self.reset_at)
+        return until
+
+
+class RateLimitTracker:
+    """Track the rate limit budgets reported by `X-RateLimit-*` and `Retry-After` headers, per token and per app."""
+
+    def __init__(self, *, min_remaining: int = 0, max_delay: float = 0.0, maxsize: int = 10000) -> None:
+        """
+        Initialize rate limit tracker.
+
+        :param min_remaining: Number of requests kept in reserve, requests are held back at or below it.
+        :param max_delay: Maximum seconds a request is delayed until the budget resets, it fails fast beyond it.
+        :param maxsize: Maximum number of tracked budgets, the least recently used budget is evicted beyond it.
+        :return:
+        """
+        self.min_remaining = min_remaining
+        self.max_delay = max_delay
+        self._budgets: LRUCache[RateLimitBudget] = LRUCache(maxsize=maxsize)
+
+    def update(self, key: str, response: httpx.Response) -> None:
+        """
+        Update the budget of a key from the rate limit headers of a response.
+
+        :param key: The budget key, e.g. `app:<client_id>` or `token:<token hash>`.
+        :param response: The provider response.
+        :return:
+        """
+        headers = response.headers
+        limit = _parse_int(headers.get('X-RateLimit-Limit'))
+        remaining = _parse_int(headers.get('X-RateLimit-Remaining'))
+        reset = _parse_int(headers.get('X-RateLimit-Reset'))
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        if limit is None and remaining is None and reset is None and retry_after is None:
+            return
+
+        budget = self._budgets.get(key) or RateLimitBudget()
+        self._budgets.set(
+            key,
+            RateLimitBudget(
+                limit=budget.limit if limit is None else limit,
+                remaining=budget.remaining if remaining is None else remaining,
+                reset_at=budget.reset_at if reset is None else float(reset),
+                retry_at=None if retry_after is None else time.time() + retry_after,
+            ),
+        )
+
+    async def acquire(self, key: str, *gates: str) -> None:
+        """
+        Wait until the budgets of the keys allow a request, or fail fast if that takes longer than `max_delay`.
+
+        An admitted request is deducted from the remaining budget of `key` right away, so that concurrent requests
+        cannot all pass on the same last remaining request. The response of the request, recorded with `update`,
+        corrects the count. The budgets of `gates` can only block the request, they are not deducted as its response
+        does not update them.
+
+        :param key: The budget key the request counts against.
+        :param gates: Further budget keys that must allow the request, e.g. the app budget for a user request.
+        :return:
+        """
+        now = time.time()
+        blocked = [
+            budget.blocked_until(self.min_remaining, now)
+            for budget_key in (key, *gates)
+            if (budget := self._budgets.get(budget_key))
+        ]
+        until = max((until for until in blocked if until is not None), default=None)
+        if until is not None:
+            delay = until - now
+            if delay > self.max_delay:
+                raise RateLimitExceededError(
+                    f'Rate limit exhausted, retry after {delay:.0f} seconds', retry_after=delay
+                )
+            await asyncio.sleep(delay)
+
+        budget = self._budgets.get(key)
+        if budget is not None and budget.remaining is not None:
+            budget.remaining -= 1
+
+    def get_budget(self, key: str) -> RateLimitBudget | None:
+        """
+        Get the current budget of a key.
+
+        :param key: The budget key.
+        :return:
+        """
+        budget = self._budgets.get(key)
+        return None if budget is None else replace(budget)
+
+    def snapshot(self) -> dict[str, RateLimitBudget]:
+        """
+        Get the current budgets of all keys, e.g. for dashboards.
+
+        :return:
+        """
+        return {str(key): replace(budget) for key, budget in self._budgets.items()}
+
+
+class TokenBucketLimiter:
+    """Client-side token bucket limiting the request rate sent to a provider, e.g. per-AppID QPS quotas."""
+
+    _shared: ClassVar[dict[str, 'TokenBucketLimiter']] = {}
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        *,
+        policy: Literal['queue', 'reject'] = 'queue',
+        max_wait: float | None = None,
+    ) -> None:
+        """
+        Initialize token bucket limiter.
+
+        :param rate: Number of requests allowed per second.
+        :param burst: Maximum number of requests sent at once after an idle period, defaults to the rate.
+        :param policy: Whether requests over the rate wait for a token or are rejected immediately.
+        :param max_wait: Maximum seconds a queued request waits for a token, None waits as long as needed.
+        :return:
+        """
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+        self.rate = rate
+        self.burst = max(int(rate), 1) if burst is None else burst
+        self.policy = policy
+        self.max_wait = max_wait
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    @classmethod
+    def shared(
+        cls,
+        key: str,
+        rate: float,
+        burst: int | None = None,
+        *,
+        policy: Literal['queue', 'reject'] = 'queue',
+        max_wait: float | None = None,
+    ) -> 'TokenBucketLimiter':
+        """
+        Get the process-wide limiter of a key, e.g. the client ID, created with the given options on first use.
+
+        Later calls must pass the same options, a mismatch raises `ValueError` instead of silently returning a limiter
+        configured differently.
+
+        :param key: The key shared by the clients counting against the same quota.
+        :param rate: Number of requests allowed per second.
+        :param burst: Maximum number of requests sent at once after an idle period, defaults to the rate.
+        :param policy: Whether requests over the rate wait for a token or are rejected immediately.
+        :param max_wait: Maximum seconds a queued request waits for a token, None waits as long as needed.
+        :return:
+        """
+        limiter = cls(rate, burst, policy=policy, max_wait=max_wait)
+        shared = cls._shared.setdefault(key, limiter)
+        options = (limiter.rate, limiter.burst, limiter.policy, limiter.max_wait)
+        if (shared.rate, shared.burst, shared.policy, shared.max_wait) != options:
+            raise ValueError(
+                f'Shared limiter {key!r} was created with rate={shared.rate}, burst={shared.burst}, '
+                f'policy={shared.policy!r}, max_wait={shared.max_wait}'
+            )
+        return shared
+
+    @property
+    def tokens(self) -> float:
+        """
+        The number of tokens currently available, negative while requests are queued.
+
+        :return:
+        """
+        self._refill(time.monotonic())
+        return self._tokens
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """
+        Take a token, waiting for it according to the policy, or raise `RateLimitExceededError`.
+
+        :return:
+        """
+        self._refill(time.monotonic())
+        # Tokens are reserved immediately and may go negative, queued requests are served in order without a lock
+        delay = max(1 - self._tokens, 0.0) / self.rate
+        if delay > 0 and (self.policy == 'reject' or (self.max_wait is not None and delay > self.max_wait)):
+            raise RateLimitExceededError(
+                f'Client-side rate limit of {self.rate:g} requests per second exceeded', retry_after=delay
+            )
+
+        self._tokens -= 1
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self._tokens = min(self._tokens + 1, self.burst)
+            raise
@@ -0,0 +1,106 @@
+import time
+
+from collections.abc import Mapping
+from typing import Any
+
+
+class TokenResponse(dict[str, Any]):
+    """Token endpoint response, a dict with typed accessors for the standard fields."""
+
+    __slots__ = ('issued_at',)
+
+    def __init__(self, data: Mapping[str, Any], /, *, issued_at: float | None = None) -> None:
+        """
+        Initialize token response.
+
+        :param data: The decoded token response.
+        :param issued_at: The time the token was issued at as a UNIX timestamp, defaults to now.
+        :return:
+        """
+        super().__init__(data)
+        self.issued_at = time.time() if issued_at is None else issued_at
+
+    @property
+    def access_token(self) -> str:
+        return self['access_token']
+
+    @property
+    def token_type(self) -> str | None:
+        return self.get('token_type')
+
+    @property
+    def expires_in(self) -> int | None:
+        expires_in = self.get('expires_in')
+        return None if expires_in is None else int(expires_in)
+
+    @property
+    def expires_at(self) -> float | None:
+        """
+        Get the absolute expiry as a UNIX timestamp, computed from `expires_in` if the provider did not send it.
+
+        :return:
+        """
+        expires_at = self.get('expires_at')
+        if expires_at is not None:
+            return float(expires_at)
+        expires_in = self.expires_in
+        return None if expires_in is None else self.issued_at + expires_in
+
+    @property
+    def refresh_token(self) -> str | None:
+        return self.get('refresh_token')
+
+    @property
+    def scope(self) -> str | None:
+        return self.get('scope')
+
+    @property
+    def id_token(self) -> str | None:
+        return self.get('id_token')
+
+    @property
+    def openid(self) -> str | None:
+        return self.get('openid')
+
+    @property
+    def unionid(self) -> str | None:
+        return self.get('unionid')
+
+
+class UserInfo(dict[str, Any]):
+    """Userinfo endpoint response, a dict with typed accessors for the fields most providers share."""
+
+    __slots__ = ()
+
+    ID_FIELDS = ('id', 'sub', 'openid', 'open_id', 'user_id')
+    NAME_FIELDS = ('name', 'nickname', 'username', 'login')
+    AVATAR_FIELDS = ('avatar_url', 'picture', 'avatar', 'headimgurl')
+
+    def _first(self, fields: tuple[str, ...]) -> Any:
+        return next((self[field] for field in fields if self.get(field) is not None), None)
+
+    @property
+    def id(self) -> str | None:
+        """
+        Get the provider user ID, e.g. `id` for GitHub or `openid` for WeChat, as a string.
+
+        :return:
+        """
+        value = self._first(self.ID_FIELDS)
+        return None if value is None else str(value)
+
+    @property
+    def name(self) -> str | None:
+        return self._first(self.NAME_FIELDS)
+
+    @property
+    def email(self) -> str | None:
+        return self.get('email')
+
+    @property
+    def avatar_url(self) -> str | None:
+        return self._first(self.AVATAR_FIELDS)
+
+    @property
+    def unionid(self) -> str | None:
+        return self.get('unionid') or self.get('union_id')
@@ -0,0 +1,62 @@
+import random
+
+from dataclasses import dataclass
+
+import httpx
+
+from fastapi_oauth20.ratelimit import parse_retry_after
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry policy for transient provider failures, with exponential backoff, full jitter and `Retry-After`."""
+
+    max_attempts: int = 3
+    methods: frozenset[str] = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    status_codes: frozenset[int] = frozenset({429, 502, 503, 504})
+    backoff_base: float = 0.1
+    backoff_max: float = 5.0
+    respect_retry_after: bool = True
+    max_retry_after: float = 30.0
+
+    def is_retryable(self, method: str, idempotent: bool | None = None) -> bool:
+        """
+        Check whether a request may be retried at all.
+
+        :param method: The HTTP method of the request.
+        :param idempotent: Whether the operation is safe to repeat, defaults to whether the method is in `methods`.
+        :return:
+        """
+        if self.max_attempts <= 1:
+            return False
+        return method.upper() in self.methods if idempotent is None else idempotent
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Get the full jitter backoff before the next attempt, a random delay up to the capped exponential backoff.
+
+        :param attempt: The number of the failed attempt, starting at 1.
+        :return:
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def get_delay(self, attempt: int, response: httpx.Response | None = None) -> float | None:
+        """
+        Get the delay before retrying a failed attempt, None if it must not be retried.
+
+        :param attempt: The number of the failed attempt, starting at 1.
+        :param response: The response of the failed attempt, None if it failed with a transport error.
+        :return:
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is None:
+            return self.get_backoff(attempt)
+        if response.status_code not in self.status_codes:
+            return None
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if self.respect_retry_after else None
+        if retry_after is None:
+            return self.get_backoff(attempt)
+        # Waiting longer than the caller likely wants is worse than surfacing the error
+        return retry_after if retry_after <= self.max_retry_after else None
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+from collections import deque
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Literal
+
+Priority = Literal['interactive', 'refresh', 'batch']
+
+PRIORITIES: tuple[Priority, ...] = ('interactive', 'refresh', 'batch')
+
+_request_priority: ContextVar[Priority | None] = ContextVar('fastapi_oauth20_request_priority', default=None)
+
+
+def current_priority() -> Priority | None:
+    """
+    Get the priority class of the requests sent from the current context, None if not set.
+
+    :return:
+    """
+    return _request_priority.get()
+
+
+@contextmanager
+def priority(value: Priority) -> Generator[None, None, None]:
+    """
+    Send the requests made within the block with a priority class, e.g. `batch` for background jobs.
+
+    :param value: The priority class.
+    :return:
+    """
+    token = _request_priority.set(value)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+@dataclass
+class PriorityStats:
+    """Queue statistics of a priority class, wait times are in seconds."""
+
+    queued: int = 0
+    admitted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.admitted if self.admitted else 0.0
+
+
+class RequestScheduler:
+    """Outbound request scheduler bounding in-flight requests and admitting queued ones by priority class."""
+
+    def __init__(self, max_concurrency: int = 10, priorities: tuple[str, ...] = PRIORITIES) -> None:
+        """
+        Initialize request scheduler.
+
+        :param max_concurrency: Maximum number of requests in flight, further requests are queued.
+        :param priorities: The priority classes, from the highest to the lowest priority.
+        :return:
+        """
+        self.max_concurrency = max_concurrency
+        self.priorities = priorities
+        self._queues: dict[str, deque[asyncio.Future[None]]] = {name: deque() for name in priorities}
+        self._stats = {name: PriorityStats() for name in priorities}
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def stats(self) -> dict[str, PriorityStats]:
+        """
+        Get the queue depth and wait times per priority class, e.g. for dashboards.
+
+        :return:
+        """
+        return {name: replace(stats, queued=len(self._queues[name])) for name, stats in self._stats.items()}
+
+    async def acquire(self, priority: str) -> None:
+        """
+        Wait for a request slot, slots are handed to the highest priority class queued first.
+
+        :param priority: The priority class of the request.
+        :return:
+        """
+        queue = self._queues.get(priority)
+        if queue is None:
+            raise ValueError(f'Unknown priority class: {priority}')
+
+        start = time.monotonic()
+        if self._in_flight < self.max_concurrency and not any(self._queues.values()):
+            self._in_flight += 1
+            self._record(priority, 0.0)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                if waiter in queue:
+                    queue.remove(waiter)
+            else:
+                # The slot was handed over right before the cancellation, pass it on
+                self.release()
+            raise
+        self._record(priority, time.monotonic() - start)
+
+    def release(self) -> None:
+        """
+        Release a request slot, handing it to the next queued request if any.
+
+        :return:
+        """
+        for name in self.priorities:
+            queue = self._queues[name]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncGenerator[None, None]:
+        """
+        Hold a request slot for the duration of the block.
+
+        :param priority: The priority class of the request.
+        :return:
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record(self, priority: str, wait: float) -> None:
+        stats = self._stats[priority]
+        stats.admitted += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+_T = TypeVar('_T')
+
+
+class SingleFlight(Generic[_T]):
+    """Deduplicate concurrent calls sharing a key, so that only one of them reaches the provider."""
+
+    def __init__(self, share_window: float = 0.0) -> None:
+        """
+        Initialize single-flight group.
+
+        :param share_window: Seconds a completed result keeps being returned to new callers of the same key.
+        :return:
+        """
+        self.share_window = share_window
+        self._calls: dict[Hashable, asyncio.Future[_T]] = {}
+        self._results: dict[Hashable, tuple[float, _T]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        Run `func` once for all concurrent callers of `key` and return its result to each of them.
+
+        :param key: The key identifying identical calls.
+        :param func: The coroutine function performing the call.
+        :return:
+        """
+        shared = self._results.get(key)
+        if shared is not None:
+            if shared[0] > time.monotonic():
+                return shared[1]
+            del self._results[key]
+
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(key, func))
+            self._calls[key] = future
+        # A cancelled caller must not cancel the call the other callers are waiting for
+        return await asyncio.shield(future)
+
+    async def _run(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        try:
+            result = await func()
+        finally:
+            del self._calls[key]
+        if self.share_window > 0:
+            self._expire()
+            self._results[key] = (time.monotonic() + self.share_window, result)
+        return result
+
+    def _expire(self) -> None:
+        # Results share the same window, so insertion order is also expiry order
+        now = time.monotonic()
+        expired: list[Hashable] = []
+        for key, (expires_at, _) in self._results.items():
+            if expires_at > now:
+                break
+            expired.append(key)
+        for key in expired:
+            del self._results[key]
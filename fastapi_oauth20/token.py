@@ -0,0 +1,135 @@
+import time
+
+from typing import Any
+
+from fastapi_oauth20.cache import CacheBackend, MemoryCache
+from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.results import TokenResponse
+
+
+class TokenManager:
+    """Expiry-aware token store on top of an OAuth2 client, refreshing tokens transparently."""
+
+    def __init__(
+        self,
+        client: OAuth20Base,
+        *,
+        skew: float = 60.0,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        """
+        Initialize token manager.
+
+        :param client: The OAuth2 client used to exchange and refresh tokens.
+        :param skew: Seconds before expiry from which a token is considered expired and gets refreshed.
+        :param maxsize: Maximum number of tokens kept by the default in-memory backend.
+        :param ttl: Maximum seconds a refreshable token is kept, tokens without refresh token expire with themselves.
+        :param backend: The cache backend storing tokens, defaults to an in-memory LRU cache.
+        :return:
+        """
+        self.client = client
+        self.skew = skew
+        self.ttl = ttl
+        self.backend = backend or MemoryCache(maxsize=maxsize)
+
+    def make_key(self, key: str) -> str:
+        """
+        Build the backend key of a token, namespaced by client so that clients can share a backend.
+
+        :param key: The key identifying the token owner.
+        :return:
+        """
+        return f'fastapi_oauth20:token:{type(self.client).__name__}:{self.client.client_id}:{key}'
+
+    @staticmethod
+    def with_expires_at(token: dict[str, Any], now: float | None = None) -> TokenResponse:
+        """
+        Add the absolute expiry `expires_at` (UNIX timestamp) to a token response computed from `expires_in`.
+
+        :param token: The token response returned by the provider.
+        :param now: The time the token was issued at, defaults to when the token response was received.
+        :return:
+        """
+        token = TokenResponse(token, issued_at=getattr(token, 'issued_at', None) if now is None else now)
+        expires_in = token.get('expires_in')
+        if expires_in is not None and 'expires_at' not in token:
+            token['expires_at'] = token.issued_at + float(expires_in)
+        return token
+
+    async def set_token(self, key: str, token: dict[str, Any]) -> TokenResponse:
+        """
+        Store a token response under a key, e.g. the token returned by the FastAPI callback for a user.
+
+        :param key: The key identifying the token owner, e.g. the user ID.
+        :param token: The token response returned by the provider.
+        :return:
+        """
+        token = self.with_expires_at(token)
+        expires_at = token.get('expires_at')
+        ttl = self.ttl
+        if token.get('refresh_token') is None and expires_at is not None:
+            # Without a refresh token the entry is useless once the access token expired
+            ttl = max(expires_at - time.time(), 0)
+        await self.backend.set(self.make_key(key), token, ttl=ttl)
+        return token
+
+    async def delete_token(self, key: str) -> None:
+        """
+        Remove the token stored under a key.
+
+        :param key: The key identifying the token owner.
+        :return:
+        """
+        await self.backend.delete(self.make_key(key))
+
+    async def exchange(self, key: str, code: str, **kwargs: Any) -> TokenResponse:
+        """
+        Exchange an authorization code for an access token and store it under a key.
+
+        :param key: The key identifying the token owner.
+        :param code: The authorization code received from the OAuth2 provider callback.
+        :param kwargs: Additional arguments passed to the client `get_access_token`, e.g. redirect_uri.
+        :return:
+        """
+        token = await self.client.get_access_token(code, **kwargs)
+        return await self.set_token(key, token)
+
+    def is_expired(self, token: dict[str, Any]) -> bool:
+        """
+        Check whether a stored token reached the skew window before its expiry.
+
+        :param token: The stored token.
+        :return:
+        """
+        expires_at = token.get('expires_at')
+        return expires_at is not None and expires_at - self.skew <= time.time()
+
+    async def get_token(self, key: str) -> TokenResponse | None:
+        """
+        Get a valid token stored under a key, refreshing it when it is about to expire.
+
+        Returns None when no token is stored or the token expired and cannot be refreshed, a token in the skew window
+        that cannot be refreshed is returned as long as it did not expire.
+
+        :param key: The key identifying the token owner.
+        :return:
+        """
+        token = await self.backend.get(self.make_key(key))
+        if token is None:
+            return None
+        if not self.is_expired(token):
+            return TokenResponse(token)
+
+        refresh_token = token.get('refresh_token')
+        if refresh_token is None or self.client.refresh_token_endpoint is None:
+            if token['expires_at'] > time.time():
+                return TokenResponse(token)
+            await self.delete_token(key)
+            return None
+
+        refreshed = await self.client.refresh_token(refresh_token)
+        # Providers that do not rotate refresh tokens omit them from the refresh response
+        refreshed.setdefault('refresh_token', refresh_token)
+        return await self.set_token(key, refreshed)
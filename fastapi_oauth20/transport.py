@@ -0,0 +1,276 @@
+import functools
+import importlib.util
+import ipaddress
+import os
+import re
+import ssl
+
+from urllib.request import getproxies
+
+import certifi
+import httpx
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+@functools.lru_cache(maxsize=None)
+def is_http2_available() -> bool:
+    """
+    Check whether the `h2` package required by httpx for HTTP/2 is installed.
+
+    :return:
+    """
+    return importlib.util.find_spec('h2') is not None
+
+
+@functools.lru_cache(maxsize=16)
+def _create_ssl_context(
+    cafile: str | None, capath: str | None, certfile: str | None, keyfile: str | None, password: str | None
+) -> ssl.SSLContext:
+    context = ssl.create_default_context(cafile=cafile, capath=capath)
+    if certfile is not None:
+        context.load_cert_chain(certfile, keyfile=keyfile, password=password)
+    return context
+
+
+def get_ssl_context(
+    cafile: str | None = None,
+    certfile: str | None = None,
+    keyfile: str | None = None,
+    password: str | None = None,
+    *,
+    trust_env: bool = True,
+) -> ssl.SSLContext:
+    """
+    Get a cached SSL context, the CA bundle is only loaded once per distinct configuration.
+
+    :param cafile: Path to a custom CA bundle, defaults to `SSL_CERT_FILE` or `SSL_CERT_DIR` like httpx does, and
+        to the certifi bundle otherwise.
+    :param certfile: Path to the client certificate for mutual TLS.
+    :param keyfile: Path to the private key of the client certificate.
+    :param password: Password used to decrypt the private key.
+    :param trust_env: Whether to honour `SSL_CERT_FILE` and `SSL_CERT_DIR` when no `cafile` is given.
+    :return:
+    """
+    capath = None
+    if cafile is None:
+        if trust_env and os.environ.get('SSL_CERT_FILE'):
+            cafile = os.environ['SSL_CERT_FILE']
+        elif trust_env and os.environ.get('SSL_CERT_DIR'):
+            capath = os.environ['SSL_CERT_DIR']
+        else:
+            cafile = certifi.where()
+    return _create_ssl_context(cafile, capath, certfile, keyfile, password)
+
+
+class _ProxyPattern:
+    """Proxy environment pattern, e.g. `https://` or `all://*example.com`, matching like the proxy mounts of httpx."""
+
+    def __init__(self, pattern: str) -> None:
+        url = httpx.URL(pattern)
+        self.scheme = '' if url.scheme == 'all' else url.scheme
+        self.host = '' if url.host == '*' else url.host
+        self.port = url.port
+        self.host_regex: re.Pattern[str] | None = None
+        if self.host.startswith('*.'):
+            # *.example.com matches www.example.com but not example.com
+            self.host_regex = re.compile(f'^.+\\.{re.escape(self.host[2:])}$')
+        elif self.host.startswith('*'):
+            # *example.com matches www.example.com and example.com, but not wwwexample.com
+            self.host_regex = re.compile(f'^(.+\\.)?{re.escape(self.host[1:])}$')
+        elif self.host:
+            self.host_regex = re.compile(f'^{re.escape(self.host)}$')
+
+    @property
+    def priority(self) -> tuple[int, int, int]:
+        # Patterns with a port, then longer hosts, then longer schemes match first
+        return 0 if self.port is not None else 1, -len(self.host), -len(self.scheme)
+
+    def matches(self, url: httpx.URL) -> bool:
+        if self.scheme and self.scheme != url.scheme:
+            return False
+        if self.host_regex is not None and not self.host_regex.match(url.host):
+            return False
+        return self.port is None or self.port == url.port
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split('/')[0])
+    except ValueError:
+        return False
+    return True
+
+
+def _get_environment_proxies() -> dict[str, str | None]:
+    # Same mapping of `HTTP_PROXY`, `HTTPS_PROXY`, `ALL_PROXY` and `NO_PROXY` as httpx, kept here as httpx only
+    # implements it privately
+    proxy_info = getproxies()
+    proxies: dict[str, str | None] = {}
+    for scheme in ('http', 'https', 'all'):
+        if proxy_info.get(scheme):
+            url = proxy_info[scheme]
+            proxies[f'{scheme}://'] = url if '://' in url else f'http://{url}'
+
+    for host in (host.strip() for host in proxy_info.get('no', '').split(',')):
+        if host == '*':
+            return {}
+        if not host:
+            continue
+        if '://' in host:
+            proxies[host] = None
+        elif _is_ip_address(host):
+            proxies[f'all://[{host}]' if ':' in host.split('/')[0] else f'all://{host}'] = None
+        elif host.lower() == 'localhost':
+            proxies[f'all://{host}'] = None
+        else:
+            # example.com and .example.com both exclude the subdomains, the former example.com itself too
+            proxies[f'all://*{host}'] = None
+    return proxies
+
+
+class TransportRegistry:
+    """Registry of connection pools shared by OAuth2 clients, keyed by provider host and proxy."""
+
+    def __init__(
+        self,
+        limits: httpx.Limits | None = None,
+        ssl_context: ssl.SSLContext | None = None,
+        *,
+        proxy: str | httpx.URL | httpx.Proxy | None = None,
+        trust_env: bool = True,
+    ) -> None:
+        """
+        Initialize transport registry.
+
+        :param limits: Default connection pool limits applied to hosts without their own limits.
+        :param ssl_context: SSL context shared by all transports, defaults to the cached context of `get_ssl_context`.
+        :param proxy: Proxy all provider requests are sent through, overrides the proxy environment variables.
+        :param trust_env: Whether to honour `HTTP_PROXY`, `HTTPS_PROXY`, `ALL_PROXY` and `NO_PROXY` like httpx does,
+            they are read once when the registry is created, and `SSL_CERT_FILE` and `SSL_CERT_DIR` when no
+            `ssl_context` is given.
+        :return:
+        """
+        self.limits = limits or DEFAULT_LIMITS
+        self.trust_env = trust_env
+        self.ssl_context = ssl_context
+        self.proxy = httpx.Proxy(proxy) if isinstance(proxy, (str, httpx.URL)) else proxy
+        self._proxies: list[tuple[_ProxyPattern, httpx.Proxy | None]] = []
+        if self.proxy is None and trust_env:
+            proxies = [
+                (_ProxyPattern(pattern), None if url is None else httpx.Proxy(url))
+                for pattern, url in _get_environment_proxies().items()
+            ]
+            # Same precedence as the proxy mounts of httpx, the most specific pattern matches first
+            self._proxies = sorted(proxies, key=lambda item: item[0].priority)
+        self._host_limits: dict[str, httpx.Limits] = {}
+        self._transports: dict[tuple[str, bool, httpx.Proxy | None], httpx.AsyncHTTPTransport] = {}
+
+    def set_limits(self, host: str, limits: httpx.Limits) -> None:
+        """
+        Configure the connection pool limits of a provider host.
+
+        Limits only apply to pools created afterwards, so configure hosts before the first request is sent.
+
+        :param host: The provider host name, e.g. `api.github.com`.
+        :param limits: The connection pool limits for the host.
+        :return:
+        """
+        self._host_limits[host] = limits
+
+    def get_limits(self, host: str) -> httpx.Limits:
+        """
+        Get the connection pool limits of a provider host.
+
+        :param host: The provider host name.
+        :return:
+        """
+        return self._host_limits.get(host, self.limits)
+
+    def get_proxy(self, url: httpx.URL) -> httpx.Proxy | None:
+        """
+        Get the proxy requests to a URL are sent through, None if they connect directly.
+
+        :param url: The request URL.
+        :return:
+        """
+        if self.proxy is not None:
+            return self.proxy
+        for pattern, proxy in self._proxies:
+            if pattern.matches(url):
+                return proxy
+        return None
+
+    def get_transport(
+        self, host: str, *, http2: bool = False, proxy: httpx.Proxy | None = None
+    ) -> httpx.AsyncHTTPTransport:
+        """
+        Get the shared transport of a provider host, creating it on first use.
+
+        :param host: The provider host name.
+        :param http2: Whether the transport negotiates HTTP/2, HTTP/1.1 and HTTP/2 pools are kept apart.
+        :param proxy: The proxy the transport connects through, see `get_proxy`.
+        :return:
+        """
+        key = (host, http2, proxy)
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = self.create_transport(host, http2=http2, proxy=proxy)
+            self._transports[key] = transport
+        return transport
+
+    def create_transport(
+        self, host: str, *, http2: bool = False, proxy: httpx.Proxy | None = None
+    ) -> httpx.AsyncHTTPTransport:
+        """
+        Create the transport of a provider host, override to customize it.
+
+        :param host: The provider host name.
+        :param http2: Whether the transport negotiates HTTP/2.
+        :param proxy: The proxy the transport connects through, None connects directly.
+        :return:
+        """
+        return httpx.AsyncHTTPTransport(
+            verify=self.ssl_context or get_ssl_context(trust_env=self.trust_env),
+            http2=http2,
+            limits=self.get_limits(host),
+            proxy=proxy,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close all shared transports and release their connections.
+
+        :return:
+        """
+        transports = list(self._transports.values())
+        self._transports.clear()
+        for transport in transports:
+            await transport.aclose()
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """Transport dispatching requests to the shared pool of their host in a transport registry."""
+
+    def __init__(self, registry: TransportRegistry, *, http2: bool = False) -> None:
+        """
+        Initialize shared transport.
+
+        :param registry: The transport registry that owns the connection pools.
+        :param http2: Whether to dispatch requests to the HTTP/2 pools of the registry.
+        :return:
+        """
+        self.registry = registry
+        self.http2 = http2
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        transport = self.registry.get_transport(url.host, http2=self.http2, proxy=self.registry.get_proxy(url))
+        return await transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # The pools are owned by the registry and outlive the clients using them.
+        pass
+
+
+default_transport_registry = TransportRegistry()
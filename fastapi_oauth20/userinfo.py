@@ -0,0 +1,109 @@
+import asyncio
+import hashlib
+import time
+
+from typing import Any
+
+import httpx
+
+from fastapi_oauth20.cache import CacheBackend, MemoryCache
+from fastapi_oauth20.errors import OAuth20BaseError
+from fastapi_oauth20.oauth20 import OAuth20Base
+from fastapi_oauth20.results import UserInfo
+from fastapi_oauth20.scheduler import priority
+from fastapi_oauth20.singleflight import SingleFlight
+
+
+class UserInfoCache:
+    """Userinfo cache in front of an OAuth2 client, with TTL and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        client: OAuth20Base,
+        *,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        maxsize: int = 1024,
+        backend: CacheBackend | None = None,
+    ) -> None:
+        """
+        Initialize userinfo cache.
+
+        :param client: The OAuth2 client used to retrieve user information.
+        :param ttl: Seconds a cached userinfo is returned without contacting the provider.
+        :param stale_ttl: Seconds after the TTL during which the stale userinfo is returned while it is refreshed in
+            the background.
+        :param maxsize: Maximum number of userinfo kept by the default in-memory backend.
+        :param backend: The cache backend storing userinfo, defaults to an in-memory LRU cache.
+        :return:
+        """
+        self.client = client
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend or MemoryCache(maxsize=maxsize)
+        self._flight: SingleFlight[dict[str, Any]] = SingleFlight()
+        self._revalidations: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def make_key(access_token: str, **kwargs: Any) -> str:
+        """
+        Build the cache key from a hash of the access token and the extra userinfo arguments, e.g. WeChat openid.
+
+        :param access_token: The access token used to retrieve user information.
+        :param kwargs: Additional arguments passed to the client `get_userinfo`.
+        :return:
+        """
+        parts = [access_token, *(f'{name}={value}' for name, value in sorted(kwargs.items()))]
+        digest = hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+        return f'fastapi_oauth20:userinfo:{digest}'
+
+    async def get_userinfo(self, access_token: str, **kwargs: Any) -> UserInfo:
+        """
+        Retrieve user information, from the cache when possible.
+
+        :param access_token: Valid access token to authenticate the request to the provider's user info endpoint.
+        :param kwargs: Additional arguments passed to the client `get_userinfo`, e.g. openid for WeChat clients.
+        :return:
+        """
+        key = self.make_key(access_token, **kwargs)
+        cached = await self.backend.get(key)
+        if cached is None:
+            return UserInfo(await self._fetch(key, access_token, **kwargs))
+
+        if time.time() - cached['fetched_at'] >= self.ttl:
+            self._revalidate(key, access_token, **kwargs)
+        return UserInfo(cached['userinfo'])
+
+    async def invalidate(self, access_token: str, **kwargs: Any) -> None:
+        """
+        Remove the cached user information of an access token.
+
+        :param access_token: The access token used to retrieve user information.
+        :param kwargs: Additional arguments passed to the client `get_userinfo`.
+        :return:
+        """
+        await self.backend.delete(self.make_key(access_token, **kwargs))
+
+    async def _fetch(self, key: str, access_token: str, **kwargs: Any) -> dict[str, Any]:
+        async def fetch() -> dict[str, Any]:
+            userinfo = await self.client.get_userinfo(access_token, **kwargs)
+            await self.backend.set(
+                key, {'fetched_at': time.time(), 'userinfo': userinfo}, ttl=self.ttl + self.stale_ttl
+            )
+            return userinfo
+
+        return await self._flight.do(key, fetch)
+
+    def _revalidate(self, key: str, access_token: str, **kwargs: Any) -> None:
+        async def revalidate() -> None:
+            try:
+                # Background revalidation must not compete with user-facing requests
+                with priority('refresh'):
+                    await self._fetch(key, access_token, **kwargs)
+            except (OAuth20BaseError, httpx.HTTPError):
+                # Keep serving the stale userinfo until it expires, the next miss surfaces the error
+                pass
+
+        task = asyncio.ensure_future(revalidate())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
@@ -1,8 +1,10 @@
+import asyncio
+
 import httpx
 import pytest
 import respx
 
-from fastapi_oauth20 import GitHubOAuth20
+from fastapi_oauth20 import GitHubOAuth20, MemoryCache
 from fastapi_oauth20.errors import GetUserInfoError, HTTPXOAuth20Error
 from fastapi_oauth20.oauth20 import OAuth20Base
 from tests.conftest import (
@@ -166,3 +168,129 @@ class TestGitHubOAuth20:
         respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(403, json=rate_limit_response))
         with pytest.raises(HTTPXOAuth20Error):
             await github_client.get_userinfo(TEST_ACCESS_TOKEN)
+
+
+@pytest.fixture
+def concurrent_github_client():
+    return GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET, concurrent_emails=True)
+
+
+class TestGitHubOAuth20ConcurrentEmails:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_without_email(self, concurrent_github_client):
+        mock_user_data = create_mock_user_data('github', email=None)
+        mock_user_info_response(respx, GITHUB_USER_INFO_URL, mock_user_data)
+        emails_data = [{'email': 'test@example.com', 'primary': True}]
+        respx.get(GITHUB_EMAILS_URL).mock(return_value=httpx.Response(200, json=emails_data))
+        result = await concurrent_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+        assert result['login'] == mock_user_data['login']
+        assert result['email'] == 'test@example.com'
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_requests_run_concurrently(self, concurrent_github_client):
+        started = asyncio.Event()
+
+        async def user_side_effect(request):
+            await asyncio.wait_for(started.wait(), 1)
+            return httpx.Response(200, json=create_mock_user_data('github', email=None))
+
+        async def emails_side_effect(request):
+            started.set()
+            return httpx.Response(200, json=[{'email': 'test@example.com', 'primary': True}])
+
+        respx.get(GITHUB_USER_INFO_URL).mock(side_effect=user_side_effect)
+        respx.get(GITHUB_EMAILS_URL).mock(side_effect=emails_side_effect)
+        result = await concurrent_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+        assert result['email'] == 'test@example.com'
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_with_email_discards_emails(self, concurrent_github_client):
+        mock_user_data = create_mock_user_data('github')
+        mock_user_info_response(respx, GITHUB_USER_INFO_URL, mock_user_data)
+        respx.get(GITHUB_EMAILS_URL).mock(return_value=httpx.Response(403, text='Forbidden'))
+        result = await concurrent_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+        assert result == mock_user_data
+        await asyncio.gather(*concurrent_github_client._discarded, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_error_discards_emails(self, concurrent_github_client):
+        respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(401, text='Unauthorized'))
+        respx.get(GITHUB_EMAILS_URL).mock(return_value=httpx.Response(401, text='Unauthorized'))
+        with pytest.raises(HTTPXOAuth20Error):
+            await concurrent_github_client.get_userinfo(INVALID_TOKEN)
+        await asyncio.gather(*concurrent_github_client._discarded, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_emails_invalid_json(self, concurrent_github_client):
+        mock_user_info_response(respx, GITHUB_USER_INFO_URL, create_mock_user_data('github', email=None))
+        respx.get(GITHUB_EMAILS_URL).mock(return_value=httpx.Response(200, text='invalid json'))
+        with pytest.raises(GetUserInfoError):
+            await concurrent_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+
+
+@pytest.fixture
+def etag_github_client():
+    return GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET, etag_cache=MemoryCache())
+
+
+class TestGitHubOAuth20ETag:
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_not_modified_returns_cached_profile(self, etag_github_client):
+        mock_user_data = create_mock_user_data('github')
+        route = respx.get(GITHUB_USER_INFO_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=mock_user_data, headers={'ETag': 'W/"abc"'}),
+                httpx.Response(304, headers={'ETag': 'W/"abc"'}),
+            ]
+        )
+        assert await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN) == mock_user_data
+        assert 'if-none-match' not in route.calls[0].request.headers
+        assert await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN) == mock_user_data
+        assert route.calls[1].request.headers['if-none-match'] == 'W/"abc"'
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_modified_updates_cache(self, etag_github_client):
+        route = respx.get(GITHUB_USER_INFO_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=create_mock_user_data('github'), headers={'ETag': '"v1"'}),
+                httpx.Response(200, json=create_mock_user_data('github', name='New Name'), headers={'ETag': '"v2"'}),
+                httpx.Response(304),
+            ]
+        )
+        await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+        assert (await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN))['name'] == 'New Name'
+        assert (await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN))['name'] == 'New Name'
+        assert route.calls[2].request.headers['if-none-match'] == '"v2"'
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_etag_cache_stores_profile_without_resolved_email(self, etag_github_client):
+        respx.get(GITHUB_USER_INFO_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=create_mock_user_data('github', email=None), headers={'ETag': '"v1"'}),
+                httpx.Response(304),
+            ]
+        )
+        emails_route = respx.get(GITHUB_EMAILS_URL).mock(
+            return_value=httpx.Response(200, json=[{'email': 'test@example.com', 'primary': True}])
+        )
+        assert (await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN))['email'] == 'test@example.com'
+        assert (await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN))['email'] == 'test@example.com'
+        assert emails_route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_userinfo_etag_cache_is_per_token(self, etag_github_client):
+        route = respx.get(GITHUB_USER_INFO_URL).mock(
+            return_value=httpx.Response(200, json=create_mock_user_data('github'), headers={'ETag': '"v1"'})
+        )
+        await etag_github_client.get_userinfo(TEST_ACCESS_TOKEN)
+        await etag_github_client.get_userinfo('other_token')
+        assert 'if-none-match' not in route.calls[1].request.headers
@@ -92,6 +92,21 @@ class TestWeChatOpenOAuth20:
         assert 'state=' in url
         assert 'lang=' in url
 
+    @pytest.mark.asyncio
+    async def test_get_authorization_url_precompiled(self, wechat_open_client):
+        url = await wechat_open_client.get_authorization_url(redirect_uri='https://example.com/callback', state='a')
+        assert url == (
+            f'https://open.weixin.qq.com/connect/qrconnect?appid={TEST_CLIENT_ID}'
+            '&redirect_uri=https%3A%2F%2Fexample.com%2Fcallback&response_type=code&lang=cn&scope=snsapi_login'
+            '&state=a#wechat_redirect'
+        )
+        url = await wechat_open_client.get_authorization_url(
+            redirect_uri='https://example.com/callback', state='b', lang='en'
+        )
+        assert 'lang=en' in url
+        assert 'lang=cn' not in url
+        assert url.endswith('&state=b#wechat_redirect')
+
     @pytest.mark.asyncio
     async def test_get_authorization_url_with_kwargs(self, wechat_open_client):
         url = await wechat_open_client.get_authorization_url(
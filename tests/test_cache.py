@@ -0,0 +1,120 @@
+import time
+
+import pytest
+import pytest_asyncio
+
+from fastapi_oauth20.cache import LRUCache, MemoryCache, SQLiteCache
+
+
+def test_get_missing_key():
+    cache = LRUCache()
+    assert cache.get('missing') is None
+
+
+def test_set_and_get():
+    cache = LRUCache()
+    cache.set('key', 'value')
+    assert cache.get('key') == 'value'
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_default_ttl_expires_entries(monkeypatch):
+    cache = LRUCache(ttl=10)
+    cache.set('key', 'value')
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('key') is None
+    assert len(cache) == 0
+
+
+def test_entry_ttl_overrides_default(monkeypatch):
+    cache = LRUCache(ttl=10)
+    cache.set('key', 'value', ttl=100)
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('key') == 'value'
+
+
+def test_delete_and_clear():
+    cache = LRUCache()
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.delete('a')
+    cache.delete('missing')
+    assert cache.get('a') is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest_asyncio.fixture(params=['memory', 'sqlite'])
+async def backend(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryCache()
+    else:
+        backend = SQLiteCache(str(tmp_path / 'cache.db'))
+        yield backend
+        await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backend_set_get_delete(backend):
+    assert await backend.get('key') is None
+    await backend.set('key', {'access_token': 'a', 'expires_in': 3600})
+    assert await backend.get('key') == {'access_token': 'a', 'expires_in': 3600}
+    await backend.delete('key')
+    assert await backend.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_backend_get_many_set_many(backend):
+    await backend.set_many({'a': 1, 'b': [2]})
+    assert await backend.get_many(['a', 'b', 'c']) == {'a': 1, 'b': [2]}
+
+
+@pytest.mark.asyncio
+async def test_backend_ttl(backend, monkeypatch):
+    await backend.set('key', 'value', ttl=10)
+    await backend.set('forever', 'value')
+    now, monotonic_now = time.time(), time.monotonic()
+    monkeypatch.setattr(time, 'time', lambda: now + 11)
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic_now + 11)
+    assert await backend.get('key') is None
+    assert await backend.get('forever') == 'value'
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    writer, reader = SQLiteCache(path), SQLiteCache(path)
+    await writer.set('key', {'access_token': 'a'})
+    assert await reader.get('key') == {'access_token': 'a'}
+    mode = reader._connect().execute('PRAGMA journal_mode').fetchone()[0]
+    assert mode == 'wal'
+    await writer.aclose()
+    await reader.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_purges_expired_entries(tmp_path):
+    backend = SQLiteCache(str(tmp_path / 'cache.db'), purge_interval=2)
+    await backend.set('expired', 'value', ttl=0)
+    await backend.set('key', 'value')
+    count = backend._connect().execute(f'SELECT COUNT(*) FROM {backend.table}').fetchone()[0]
+    assert count == 1
+    await backend.aclose()
+
+
+def test_sqlite_cache_invalid_table_name():
+    with pytest.raises(ValueError, match='Invalid cache table name'):
+        SQLiteCache(':memory:', table='cache; DROP TABLE users')
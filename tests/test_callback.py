@@ -423,6 +423,25 @@ class TestFastAPIOAuth20Integration:
         oauth_dep_custom = FastAPIOAuth20(github_client, redirect_uri=custom_redirect)
         assert oauth_dep_custom.client == github_client
 
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_dependency_does_no_reflection_per_callback(self, fastapi_app, monkeypatch):
+        """Test the client signature is inspected once, when the dependency is created."""
+        provider_config = OAUTH_PROVIDERS[0]
+        mock_oauth_token_response(respx, provider_config)
+        github_client = GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+        oauth_callback = FastAPIOAuth20(github_client, redirect_uri=provider_config['redirect_uri'])
+        callback_path = setup_oauth_callback_route(fastapi_app, provider_config, oauth_callback)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('inspect.signature called on the callback path')
+
+        monkeypatch.setattr('fastapi_oauth20.callback.inspect.signature', fail)
+        response = TestClient(fastapi_app).get(f'{callback_path}?code=test_code&state={TEST_STATE}')
+
+        assert response.status_code == 200
+        assert respx.calls.last.request.content.decode().count('redirect_uri=') == 1
+
     def test_multiple_apps_same_provider(self):
         """Test the same OAuth provider in multiple FastAPI apps."""
         github_client = GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
@@ -0,0 +1,196 @@
+from typing import Annotated, Any
+
+import httpx
+import pytest
+import respx
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_oauth20 import CircuitBreaker, FastAPIOAuth20, GoogleOAuth20, TokenBucketLimiter
+from fastapi_oauth20.errors import CircuitOpenError, HTTPXOAuth20Error, OAuth20RequestError
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET
+
+ENDPOINT = 'https://example.com/userinfo'
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('fastapi_oauth20.circuitbreaker.time.monotonic', lambda: now[0])
+    return now
+
+
+def fail(breaker: CircuitBreaker, times: int, key: str = ENDPOINT) -> None:
+    for _ in range(times):
+        generation = breaker.acquire(key)
+        breaker.record(key, generation, failed=True, duration=0.01)
+
+
+def test_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, min_calls=4)
+    for failed in (False, True, False):
+        generation = breaker.acquire(ENDPOINT)
+        breaker.record(ENDPOINT, generation, failed=failed, duration=0.01)
+    assert breaker.get_state(ENDPOINT) == 'closed'
+    fail(breaker, 1)
+    assert breaker.get_state(ENDPOINT) == 'open'
+    assert breaker.get_state('https://example.com/other') == 'closed'
+
+
+def test_opens_on_slow_calls(clock):
+    breaker = CircuitBreaker(slow_call_duration=1.0, slow_call_rate_threshold=0.5, min_calls=2)
+    generation = breaker.acquire(ENDPOINT)
+    breaker.record(ENDPOINT, generation, failed=False, duration=0.1)
+    generation = breaker.acquire(ENDPOINT)
+    breaker.record(ENDPOINT, generation, failed=False, duration=2.0)
+    assert breaker.get_state(ENDPOINT) == 'open'
+
+
+def test_failure_rate_is_computed_over_window(clock):
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, min_calls=4)
+    fail(breaker, 1)
+    for _ in range(4):
+        generation = breaker.acquire(ENDPOINT)
+        breaker.record(ENDPOINT, generation, failed=False, duration=0.01)
+    fail(breaker, 1)
+    assert breaker.get_state(ENDPOINT) == 'closed'
+
+
+def test_open_circuit_fails_fast(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    fail(breaker, 1)
+    clock[0] += 10
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.acquire(ENDPOINT)
+    assert exc_info.value.retry_after == 20
+    assert exc_info.value.response is None
+
+
+def test_half_open_probe_closes_circuit(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    fail(breaker, 1)
+    clock[0] += 30
+    assert breaker.get_state(ENDPOINT) == 'half_open'
+    generation = breaker.acquire(ENDPOINT)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(ENDPOINT)
+    breaker.record(ENDPOINT, generation, failed=False, duration=0.01)
+    assert breaker.get_state(ENDPOINT) == 'closed'
+    breaker.acquire(ENDPOINT)
+
+
+def test_half_open_probe_failure_reopens_circuit(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    fail(breaker, 1)
+    clock[0] += 30
+    fail(breaker, 1)
+    assert breaker.get_state(ENDPOINT) == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(ENDPOINT)
+
+
+def test_release_frees_probe(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    fail(breaker, 1)
+    clock[0] += 30
+    generation = breaker.acquire(ENDPOINT)
+    breaker.release(ENDPOINT, generation)
+    breaker.acquire(ENDPOINT)
+
+
+def test_stale_outcomes_are_ignored(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    slow = breaker.acquire(ENDPOINT)
+    fail(breaker, 1)
+    clock[0] += 30
+    probe = breaker.acquire(ENDPOINT)
+    breaker.record(ENDPOINT, slow, failed=False, duration=40)
+    assert breaker.get_state(ENDPOINT) == 'half_open'
+    breaker.record(ENDPOINT, slow, failed=True, duration=40)
+    breaker.release(ENDPOINT, slow)
+    assert breaker.get_state(ENDPOINT) == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(ENDPOINT)
+    breaker.record(ENDPOINT, probe, failed=False, duration=0.01)
+    assert breaker.get_state(ENDPOINT) == 'closed'
+
+
+def test_check_does_not_let_calls_through(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=30)
+    breaker.check(ENDPOINT)
+    fail(breaker, 1)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(ENDPOINT)
+    clock[0] += 30
+    breaker.check(ENDPOINT)
+    breaker.check(ENDPOINT)
+    breaker.acquire(ENDPOINT)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(ENDPOINT)
+
+
+def test_circuit_open_error_hierarchy():
+    assert isinstance(CircuitOpenError('open'), OAuth20RequestError)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_fails_fast_while_circuit_open():
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, circuit_breaker=CircuitBreaker(min_calls=2))
+    route = respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(503))
+    for _ in range(2):
+        with pytest.raises(HTTPXOAuth20Error):
+            await client.get_userinfo(TEST_ACCESS_TOKEN)
+    with pytest.raises(CircuitOpenError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.call_count == 2
+    assert client.circuit_breaker.get_state(GOOGLE_TOKEN_URL) == 'closed'
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_open_circuit_fails_before_rate_limiter():
+    limiter = TokenBucketLimiter(rate=1, burst=1, policy='reject')
+    breaker = CircuitBreaker(min_calls=1)
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, circuit_breaker=breaker, rate_limiter=limiter)
+    fail(breaker, 1, GOOGLE_USER_INFO_URL)
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert limiter.tokens == pytest.approx(1)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_counts_transport_errors():
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, circuit_breaker=CircuitBreaker(min_calls=1))
+    respx.get(GOOGLE_USER_INFO_URL).mock(side_effect=httpx.ConnectTimeout('timeout'))
+    with pytest.raises(httpx.ConnectTimeout):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert client.circuit_breaker.get_state(GOOGLE_USER_INFO_URL) == 'open'
+
+
+@respx.mock
+def test_callback_maps_open_circuit_to_503():
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, circuit_breaker=CircuitBreaker(min_calls=1))
+    route = respx.post(GOOGLE_TOKEN_URL).mock(return_value=httpx.Response(502))
+    app = FastAPI()
+
+    @app.get('/callback')
+    async def callback(
+        result: Annotated[
+            tuple[dict[str, Any], str | None],
+            Depends(FastAPIOAuth20(client, redirect_uri='https://example.com/callback')),
+        ],
+    ):
+        return result
+
+    test_client = TestClient(app)
+    assert test_client.get('/callback?code=code').status_code == 500
+    response = test_client.get('/callback?code=code')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) > 0
+    assert route.call_count == 1
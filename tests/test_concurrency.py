@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import AdaptiveConcurrencyLimiter, GoogleOAuth20, concurrency
+from fastapi_oauth20.errors import HTTPXOAuth20Error
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+HOST = 'api.example.com'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+
+@pytest.mark.asyncio
+async def test_additive_increase():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+    for _ in range(4):
+        await limiter.acquire(HOST)
+        limiter.record(HOST, overloaded=False, duration=0.01)
+    assert limiter.get_limit(HOST) == 3
+    for _ in range(10):
+        await limiter.acquire(HOST)
+        limiter.record(HOST, overloaded=False, duration=0.01)
+    assert limiter.get_limit(HOST) == 3
+    assert limiter.snapshot() == {HOST: (3, 0)}
+
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_once_per_window():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=2)
+    for _ in range(3):
+        await limiter.acquire(HOST)
+    for _ in range(3):
+        limiter.record(HOST, overloaded=True, duration=0.01)
+    assert limiter.get_limit(HOST) == 4
+
+    for _ in range(3):
+        await limiter.acquire(HOST)
+        limiter.record(HOST, overloaded=True, duration=0)
+    assert limiter.get_limit(HOST) == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_count_as_overload():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, latency_tolerance=3)
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=False, duration=0.01)
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=False, duration=0.02)
+    assert limiter.get_limit(HOST) == 8
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=False, duration=0.05)
+    assert limiter.get_limit(HOST) == 4
+
+    absolute = AdaptiveConcurrencyLimiter(initial_limit=8, latency_threshold=1)
+    await absolute.acquire(HOST)
+    absolute.record(HOST, overloaded=False, duration=0.5)
+    assert absolute.get_limit(HOST) == 8
+
+
+@pytest.mark.asyncio
+async def test_single_fast_response_leaves_the_baseline(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(concurrency.time, 'monotonic', lambda: clock[0])
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_window=100)
+    for duration in [0.005] + [0.05] * 2000:
+        await limiter.acquire(HOST)
+        clock[0] += duration
+        limiter.record(HOST, overloaded=False, duration=duration)
+    assert limiter.get_limit(HOST) > 10
+
+
+@pytest.mark.asyncio
+async def test_latency_baseline_per_endpoint():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    for _ in range(5):
+        await limiter.acquire(HOST)
+        limiter.record(HOST, overloaded=False, duration=0.005, endpoint='/token')
+        await limiter.acquire(HOST)
+        limiter.record(HOST, overloaded=False, duration=0.05, endpoint='/userinfo')
+    assert limiter.get_limit(HOST) == 9
+
+
+@pytest.mark.asyncio
+async def test_responses_without_latency_signal():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=False, duration=None)
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=False, duration=0.05)
+    assert limiter.get_limit(HOST) == 8
+    await limiter.acquire(HOST)
+    limiter.record(HOST, overloaded=True, duration=None)
+    assert limiter.get_limit(HOST) == 4
+
+
+@pytest.mark.asyncio
+async def test_requests_wait_for_room():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire(HOST)
+    waiting = asyncio.ensure_future(limiter.acquire(HOST))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    limiter.record(HOST, overloaded=False, duration=0.01)
+    await waiting
+    assert limiter.snapshot()[HOST][1] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire(HOST)
+    waiting = asyncio.ensure_future(limiter.acquire(HOST))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    limiter.release(HOST)
+    assert limiter.snapshot()[HOST] == (1, 0)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_adapts_limit_per_host():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, concurrency_limiter=limiter)
+    respx.get(GOOGLE_USER_INFO_URL).mock(
+        side_effect=[httpx.Response(200, json=create_mock_user_data('google')), httpx.Response(503)]
+    )
+    await client.get_userinfo(TEST_ACCESS_TOKEN)
+    with pytest.raises(HTTPXOAuth20Error):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert limiter.snapshot() == {'www.googleapis.com': (5, 0)}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_ignores_latency_of_error_responses():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, concurrency_limiter=limiter)
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(401))
+    with pytest.raises(HTTPXOAuth20Error):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert limiter._hosts['www.googleapis.com'].latencies == {}
@@ -0,0 +1,164 @@
+import asyncio
+import time
+
+from typing import Annotated, Any
+
+import httpx
+import pytest
+import respx
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from fastapi_oauth20 import FastAPIOAuth20, GitHubOAuth20, GoogleOAuth20, RetryPolicy, deadline
+from fastapi_oauth20.deadline import cap_timeout, current_deadline, remaining_time
+from fastapi_oauth20.errors import DeadlineExceededError, OAuth20RequestError
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+
+class SlowTransport(httpx.AsyncBaseTransport):
+    def __init__(self, delay: float, response: httpx.Response) -> None:
+        self.delay = delay
+        self.response = response
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.response
+
+
+def google_client(transport: httpx.AsyncBaseTransport, **kwargs: Any) -> GoogleOAuth20:
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, **kwargs)
+    client.create_http_client = lambda: httpx.AsyncClient(transport=transport)
+    return client
+
+
+def test_deadline_is_never_extended():
+    assert current_deadline() is None
+    assert remaining_time() is None
+    with deadline(10) as outer:
+        assert outer == current_deadline()
+        with deadline(100) as inner:
+            assert inner == outer
+        with deadline(1):
+            assert remaining_time() <= 1
+        with deadline(at=outer - 5):
+            assert current_deadline() == outer - 5
+    with deadline() as unset:
+        assert unset is None
+    assert current_deadline() is None
+
+
+def test_cap_timeout():
+    capped = cap_timeout(httpx.Timeout(5.0, connect=1.0, pool=None), 2.0)
+    assert capped == httpx.Timeout(connect=1.0, read=2.0, write=2.0, pool=2.0)
+
+
+def test_timeouts_per_endpoint():
+    client = GoogleOAuth20(
+        TEST_CLIENT_ID,
+        TEST_CLIENT_SECRET,
+        timeouts={'access_token': httpx.Timeout(3.0, connect=1.0), 'userinfo': 2.0},
+    )
+    assert client.timeouts['access_token'] == httpx.Timeout(3.0, connect=1.0)
+    assert client.timeouts['userinfo'] == httpx.Timeout(2.0)
+    with pytest.raises(ValueError):
+        GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, timeouts={'authorize': 1.0})
+    with pytest.raises(ValueError):
+        GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, timeouts={'revoke_token': 1.0})
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_token_exchange_and_refresh_timeouts_share_url():
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, timeouts={'access_token': 2.0, 'refresh_token': 30.0})
+    assert client.access_token_endpoint == client.refresh_token_endpoint == GOOGLE_TOKEN_URL
+    route = respx.post(GOOGLE_TOKEN_URL).mock(return_value=httpx.Response(200, json={'access_token': 'token'}))
+
+    await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    assert route.calls.last.request.extensions['timeout']['read'] == 2.0
+    await client.refresh_token('refresh')
+    assert route.calls.last.request.extensions['timeout']['read'] == 30.0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_request_uses_endpoint_timeout():
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, timeouts={'userinfo': httpx.Timeout(2.0, connect=0.5)})
+    route = respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, json=create_mock_user_data('google')))
+    await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.calls.last.request.extensions['timeout'] == {'connect': 0.5, 'read': 2.0, 'write': 2.0, 'pool': 2.0}
+
+    with deadline(1.0):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    timeout = route.calls.last.request.extensions['timeout']
+    assert timeout['connect'] == 0.5
+    assert 0.9 < timeout['read'] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_fails_before_request():
+    transport = SlowTransport(0, httpx.Response(200, json={}))
+    client = google_client(transport)
+    with deadline(0), pytest.raises(DeadlineExceededError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert transport.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_slow_request():
+    client = google_client(SlowTransport(1.0, httpx.Response(200, json={})))
+    start = time.monotonic()
+    with deadline(0.05), pytest.raises(DeadlineExceededError) as exc_info:
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert time.monotonic() - start < 0.5
+    assert isinstance(exc_info.value, OAuth20RequestError)
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_when_delay_exceeds_deadline():
+    transport = SlowTransport(0, httpx.Response(503, headers={'Retry-After': '5'}))
+    client = google_client(transport, retry_policy=RetryPolicy())
+    with deadline(1.0), pytest.raises(OAuth20RequestError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert transport.calls == 1
+
+
+def test_callback_deadline():
+    client = google_client(SlowTransport(1.0, httpx.Response(200, json={'access_token': 'token'})))
+    app = FastAPI()
+
+    @app.get('/callback')
+    async def callback(
+        request: Request,
+        result: Annotated[
+            tuple[dict[str, Any], str | None],
+            Depends(FastAPIOAuth20(client, redirect_uri='https://example.com/callback', timeout=0.05)),
+        ],
+    ):
+        return result
+
+    response = TestClient(app).get('/callback?code=code')
+    assert response.status_code == 504
+
+
+def test_callback_exposes_deadline():
+    client = google_client(SlowTransport(0, httpx.Response(200, json={'access_token': 'token'})))
+    app = FastAPI()
+
+    @app.get('/callback')
+    async def callback(
+        request: Request,
+        result: Annotated[
+            tuple[dict[str, Any], str | None],
+            Depends(FastAPIOAuth20(client, redirect_uri='https://example.com/callback', timeout=5)),
+        ],
+    ):
+        return {'remaining': request.state.oauth20_deadline - time.monotonic()}
+
+    response = TestClient(app).get('/callback?code=code')
+    assert 0 < response.json()['remaining'] <= 5
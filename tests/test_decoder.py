@@ -0,0 +1,55 @@
+import importlib
+import importlib.util
+import json
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GoogleOAuth20, decoder
+from fastapi_oauth20.errors import GetUserInfoError
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET
+
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+PAYLOAD = {'id': 123456, 'name': '测试用户 ✓', 'verified': True, 'score': 1.5, 'tags': ['a', None], 'meta': {}}
+
+
+@pytest.fixture
+def stdlib_decoder(monkeypatch):
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+    yield importlib.reload(decoder)
+    monkeypatch.undo()
+    importlib.reload(decoder)
+
+
+def test_loads_matches_stdlib():
+    content = json.dumps(PAYLOAD, ensure_ascii=False).encode()
+    assert decoder.loads(content) == json.loads(content)
+
+
+def test_loads_invalid_json_raises_decode_error():
+    with pytest.raises(decoder.DECODE_ERRORS):
+        decoder.loads(b'{"id": ')
+
+
+def test_decoder_prefers_installed_fast_decoder():
+    expected = next((name for name in ('orjson', 'msgspec') if importlib.util.find_spec(name) is not None), 'json')
+    assert decoder.JSON_DECODER == expected
+
+
+def test_stdlib_fallback(stdlib_decoder):
+    assert stdlib_decoder.JSON_DECODER == 'json'
+    assert stdlib_decoder.loads(json.dumps(PAYLOAD).encode()) == PAYLOAD
+    with pytest.raises(stdlib_decoder.DECODE_ERRORS):
+        stdlib_decoder.loads(b'\xff\xfe{')
+
+
+@pytest.mark.asyncio
+@respx.mock
+@pytest.mark.parametrize('content', [b'not json', b'{"id": 1', b'\xff\xfe\x00'])
+async def test_get_userinfo_invalid_body_maps_to_error(content):
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, content=content))
+    client = GoogleOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+    with pytest.raises(GetUserInfoError, match='Result serialization failed'):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
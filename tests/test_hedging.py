@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+
+from fastapi_oauth20 import GoogleOAuth20, Hedger
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+KEY = 'https://example.com/userinfo'
+
+
+def make_func(*delays: float, error_on: int | None = None):
+    calls = []
+
+    async def func() -> int:
+        index = len(calls)
+        calls.append(index)
+        await asyncio.sleep(delays[index])
+        if index == error_on:
+            raise httpx.ReadError('Connection reset')
+        return index
+
+    return func, calls
+
+
+def test_get_delay_uses_percentile():
+    hedger = Hedger(percentile=0.9, min_samples=10, min_delay=0.001)
+    assert hedger.get_delay(KEY) is None
+    assert Hedger(initial_delay=0.5).get_delay(KEY) == 0.5
+    for latency in range(1, 11):
+        hedger.record(KEY, latency / 100)
+    assert hedger.get_delay(KEY) == 0.09
+    floored = Hedger(min_samples=1, min_delay=1)
+    floored.record(KEY, 0.01)
+    assert floored.get_delay(KEY) == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged():
+    hedger = Hedger(initial_delay=0.05)
+    func, calls = make_func(0)
+    assert await hedger.run(KEY, func) == 0
+    assert calls == [0]
+    assert hedger.stats().hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged():
+    hedger = Hedger(initial_delay=0.01)
+    func, calls = make_func(1, 0)
+    assert await hedger.run(KEY, func) == 1
+    assert calls == [0, 1]
+    stats = hedger.stats()
+    assert (stats.requests, stats.hedged, stats.hedge_wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_request_waits_for_other():
+    hedger = Hedger(initial_delay=0.01)
+    func, _ = make_func(0.02, 0.03, error_on=0)
+    assert await hedger.run(KEY, func) == 1
+
+
+@pytest.mark.asyncio
+async def test_raises_when_both_fail():
+    hedger = Hedger(initial_delay=0.01)
+    calls = []
+
+    async def func() -> None:
+        calls.append(len(calls))
+        await asyncio.sleep(0.02)
+        raise httpx.ReadError(f'Connection reset {len(calls)}')
+
+    with pytest.raises(httpx.ReadError):
+        await hedger.run(KEY, func)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedged_requests():
+    hedger = Hedger(initial_delay=0, budget_ratio=0.5, max_budget=1)
+    for _ in range(4):
+        func, _ = make_func(0.005, 0.005)
+        await hedger.run(KEY, func)
+    assert hedger.stats().hedged == 2
+
+
+@pytest.mark.asyncio
+async def test_loser_is_cancelled():
+    hedger = Hedger(initial_delay=0.01)
+    cancelled = []
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return 'slow'
+
+    async def fast() -> str:
+        return 'fast'
+
+    funcs = iter([slow, fast])
+    assert await hedger.run(KEY, lambda: next(funcs)()) == 'fast'
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+
+
+class SlowFirstTransport(httpx.AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=create_mock_user_data('google'))
+
+
+@pytest.mark.asyncio
+async def test_client_hedges_userinfo_only():
+    transport = SlowFirstTransport()
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, hedger=Hedger(initial_delay=0.01))
+    client.create_http_client = lambda: httpx.AsyncClient(transport=transport)
+    assert await client.get_userinfo(TEST_ACCESS_TOKEN) == create_mock_user_data('google')
+    assert transport.calls == 2
+    assert client.hedger.stats().hedge_wins == 1
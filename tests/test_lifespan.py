@@ -0,0 +1,110 @@
+import httpx
+import pytest
+import respx
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from fastapi_oauth20 import (
+    AdaptiveConcurrencyLimiter,
+    GitHubOAuth20,
+    GoogleOAuth20,
+    RetryPolicy,
+    TransportRegistry,
+    oauth20_lifespan,
+)
+from fastapi_oauth20.errors import HTTPXOAuth20Error
+from fastapi_oauth20.lifespan import warmup_clients
+from tests.conftest import TEST_CLIENT_ID, TEST_CLIENT_SECRET
+
+GITHUB_TOKEN_URL = 'https://github.com/login/oauth/access_token'
+GITHUB_USER_INFO_URL = 'https://api.github.com/user'
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+
+@pytest.fixture
+def registry():
+    return TransportRegistry()
+
+
+@pytest.fixture
+def github_client(registry):
+    return GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, transport_registry=registry)
+
+
+@pytest.fixture
+def google_client(registry):
+    return GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, transport_registry=registry)
+
+
+def mock_warmup_routes():
+    for url in (GITHUB_TOKEN_URL, GITHUB_USER_INFO_URL, GOOGLE_TOKEN_URL, GOOGLE_USER_INFO_URL):
+        respx.head(url).mock(return_value=httpx.Response(405))
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_reports_timings_per_endpoint(github_client):
+    mock_warmup_routes()
+    timings = await github_client.warmup()
+    assert set(timings) == {GITHUB_TOKEN_URL, GITHUB_USER_INFO_URL}
+    assert all(timing >= 0 for timing in timings.values())
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_bypasses_request_pipeline(registry):
+    limiter = AdaptiveConcurrencyLimiter()
+    client = GitHubOAuth20(
+        TEST_CLIENT_ID,
+        TEST_CLIENT_SECRET,
+        transport_registry=registry,
+        retry_policy=RetryPolicy(max_attempts=3, backoff_base=0),
+        concurrency_limiter=limiter,
+    )
+    route = respx.head(GITHUB_TOKEN_URL).mock(return_value=httpx.Response(503))
+    respx.head(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(405))
+    await client.warmup()
+    assert route.call_count == 1
+    assert limiter.snapshot() == {}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_connect_error(github_client):
+    mock_warmup_routes()
+    respx.head(GITHUB_USER_INFO_URL).mock(side_effect=httpx.ConnectError('Connection refused'))
+    with pytest.raises(HTTPXOAuth20Error, match='Warmup of https://api.github.com/user failed'):
+        await github_client.warmup()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_clients_skips_failures(github_client, google_client):
+    mock_warmup_routes()
+    respx.head(GOOGLE_TOKEN_URL).mock(side_effect=httpx.ConnectError('Connection refused'))
+    timings = await warmup_clients(github_client, google_client, raise_on_error=False)
+    assert set(timings) == {GITHUB_TOKEN_URL, GITHUB_USER_INFO_URL}
+    with pytest.raises(HTTPXOAuth20Error):
+        await warmup_clients(github_client, google_client)
+
+
+@respx.mock
+def test_lifespan_warms_up_and_closes_clients(github_client, google_client, registry):
+    mock_warmup_routes()
+    app = FastAPI(lifespan=oauth20_lifespan(github_client, google_client))
+
+    @app.get('/ready')
+    async def ready(request: Request):
+        return {'endpoints': sorted(request.app.state.oauth20_warmup)}
+
+    with TestClient(app) as client:
+        response = client.get('/ready')
+        http_client = github_client.http_client
+
+    assert response.json() == {
+        'endpoints': sorted([GITHUB_TOKEN_URL, GITHUB_USER_INFO_URL, GOOGLE_TOKEN_URL, GOOGLE_USER_INFO_URL])
+    }
+    assert http_client.is_closed
+    assert registry._transports == {}
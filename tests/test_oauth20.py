@@ -1,4 +1,4 @@
-import json
+import asyncio
 
 from typing import Any
 from unittest.mock import Mock
@@ -142,6 +142,43 @@ async def test_get_authorization_url_with_extra_params(oauth_client):
     assert 'prompt=consent' in url
 
 
+@pytest.mark.asyncio
+async def test_get_authorization_url_reuses_static_query(oauth_client):
+    url = await oauth_client.get_authorization_url(
+        redirect_uri='https://example.com/callback', state='state_1', code_challenge='challenge_1'
+    )
+    assert url == (
+        'https://example.com/oauth/authorize?client_id=test_client_id'
+        '&redirect_uri=https%3A%2F%2Fexample.com%2Fcallback&response_type=code&scope=read+write'
+        '&state=state_1&code_challenge=challenge_1'
+    )
+    url = await oauth_client.get_authorization_url(redirect_uri='https://example.com/callback', state='state_2')
+    assert url.endswith('scope=read+write&state=state_2')
+    assert len(oauth_client._authorization_queries) == 1
+
+    await oauth_client.get_authorization_url(redirect_uri='https://example.com/callback', scope=['read'])
+    assert len(oauth_client._authorization_queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_authorization_url_cache_is_bounded(oauth_client):
+    oauth_client._authorization_queries.maxsize = 2
+    for index in range(5):
+        await oauth_client.get_authorization_url(redirect_uri=f'https://example.com/callback/{index}')
+    assert len(oauth_client._authorization_queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_authorization_url_kwargs_override_static_params(oauth_client):
+    url = await oauth_client.get_authorization_url(
+        redirect_uri='https://example.com/callback', state='state', response_type='token'
+    )
+    assert url == (
+        'https://example.com/oauth/authorize?client_id=test_client_id'
+        '&redirect_uri=https%3A%2F%2Fexample.com%2Fcallback&response_type=token&scope=read+write&state=state'
+    )
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_get_access_token_success(oauth_client):
@@ -189,6 +226,72 @@ async def test_get_access_token_with_basic_auth():
     assert request.headers['authorization'].startswith('Basic ')
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_access_token_form_body_matches_httpx_encoding(oauth_client):
+    route = respx.post('https://example.com/oauth/token').mock(return_value=httpx.Response(200, json={}))
+    await oauth_client.get_access_token(code='a b&c', redirect_uri='https://example.com/callback')
+    request = route.calls[0].request
+    expected = httpx.Request(
+        'POST',
+        'https://example.com/oauth/token',
+        data={
+            'grant_type': 'authorization_code',
+            'code': 'a b&c',
+            'redirect_uri': 'https://example.com/callback',
+            'client_id': 'test_client_id',
+            'client_secret': 'test_client_secret',
+        },
+    )
+    assert dict(httpx.QueryParams(request.content.decode())) == dict(httpx.QueryParams(expected.content.decode()))
+    assert request.headers['content-type'] == 'application/x-www-form-urlencoded'
+    assert 'authorization' not in request.headers
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_access_token_basic_auth_header_matches_httpx():
+    client = MockOAuth20Client(
+        client_id='test id:ü',
+        client_secret='test secret',
+        authorize_endpoint='https://example.com/auth',
+        access_token_endpoint='https://example.com/token',
+        userinfo_endpoint='https://example.com/userinfo',
+        token_endpoint_basic_auth=True,
+    )
+    route = respx.post('https://example.com/token').mock(return_value=httpx.Response(200, json={}))
+    await client.get_access_token(code='auth_code_123', redirect_uri='https://example.com/callback')
+    request = route.calls[0].request
+    expected = next(httpx.BasicAuth('test id:ü', 'test secret').auth_flow(httpx.Request('POST', 'https://x')))
+    assert request.headers['authorization'] == expected.headers['authorization']
+    assert b'client_secret' not in request.content
+
+
+@pytest.mark.asyncio
+@respx.mock
+@pytest.mark.parametrize('basic_auth', [False, True])
+async def test_token_requests_use_rotated_client_secret(basic_auth):
+    client = MockOAuth20Client(
+        client_id='test_id',
+        client_secret='old_secret',
+        authorize_endpoint='https://example.com/auth',
+        access_token_endpoint='https://example.com/token',
+        userinfo_endpoint='https://example.com/userinfo',
+        token_endpoint_basic_auth=basic_auth,
+    )
+    route = respx.post('https://example.com/token').mock(return_value=httpx.Response(200, json={}))
+    await client.get_access_token(code='auth_code_123', redirect_uri='https://example.com/callback')
+    client.client_secret = 'new_secret'
+    await client.get_access_token(code='auth_code_123', redirect_uri='https://example.com/callback')
+    request = route.calls[1].request
+    if basic_auth:
+        expected = next(httpx.BasicAuth('test_id', 'new_secret').auth_flow(httpx.Request('POST', 'https://x')))
+        assert request.headers['authorization'] == expected.headers['authorization']
+    else:
+        assert httpx.QueryParams(request.content.decode())['client_secret'] == 'new_secret'
+    assert client.uses_client_credentials({'content': request.content, 'headers': request.headers})
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_get_access_token_http_error(oauth_client):
@@ -227,6 +330,39 @@ async def test_refresh_token_with_basic_auth():
     assert request.headers['authorization'].startswith('Basic ')
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_refresh_token_concurrent_calls_are_deduplicated(oauth_client):
+    mock_token_data = {'access_token': 'refreshed_access_token', 'refresh_token': 'rotated_refresh_token'}
+    route = respx.post('https://example.com/oauth/refresh').mock(return_value=httpx.Response(200, json=mock_token_data))
+    results = await asyncio.gather(*(oauth_client.refresh_token('refresh_token_123') for _ in range(5)))
+    assert results == [mock_token_data] * 5
+    assert route.call_count == 1
+    results[0]['access_token'] = 'changed'
+    assert results[1]['access_token'] == 'refreshed_access_token'
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_refresh_token_share_window():
+    client = MockOAuth20Client(
+        client_id='test_id',
+        client_secret='test_secret',
+        authorize_endpoint='https://example.com/auth',
+        access_token_endpoint='https://example.com/token',
+        userinfo_endpoint='https://example.com/userinfo',
+        refresh_token_endpoint='https://example.com/oauth/refresh',
+        refresh_share_window=60,
+    )
+    mock_token_data = {'access_token': 'refreshed_access_token'}
+    route = respx.post('https://example.com/oauth/refresh').mock(return_value=httpx.Response(200, json=mock_token_data))
+    assert await client.refresh_token('refresh_token_123') == mock_token_data
+    assert await client.refresh_token('refresh_token_123') == mock_token_data
+    assert route.call_count == 1
+    await client.refresh_token('other_refresh_token')
+    assert route.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_refresh_token_missing_endpoint():
     client = MockOAuth20Client(
@@ -306,6 +442,37 @@ async def test_revoke_token_http_error(oauth_client):
         await oauth_client.revoke_token('invalid_token')
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_http_client_is_reused_across_requests(oauth_client):
+    mock_token_data = {'access_token': 'new_access_token'}
+    respx.post('https://example.com/oauth/token').mock(return_value=httpx.Response(200, json=mock_token_data))
+    respx.post('https://example.com/oauth/refresh').mock(return_value=httpx.Response(200, json=mock_token_data))
+    http_client = oauth_client.http_client
+    await oauth_client.get_access_token(code='auth_code_123', redirect_uri='https://example.com/callback')
+    await oauth_client.refresh_token('refresh_token_123')
+    assert oauth_client.http_client is http_client
+    assert not http_client.is_closed
+    await oauth_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_http_client(oauth_client):
+    http_client = oauth_client.http_client
+    await oauth_client.aclose()
+    assert http_client.is_closed
+    assert oauth_client.http_client is not http_client
+    await oauth_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_context_manager_closes_http_client(oauth_client):
+    async with oauth_client as client:
+        assert client is oauth_client
+        http_client = client.http_client
+    assert http_client.is_closed
+
+
 def test_raise_httpx_oauth20_errors_success():
     mock_response = Mock()
     mock_response.raise_for_status.return_value = None
@@ -329,14 +496,12 @@ def test_raise_httpx_oauth20_errors_network_error():
 
 
 def test_get_json_result_success():
-    mock_response = Mock()
-    mock_response.json.return_value = {'key': 'value'}
-    result = OAuth20Base.get_json_result(mock_response, err_class=AccessTokenError)
+    response = httpx.Response(200, json={'key': 'value'})
+    result = OAuth20Base.get_json_result(response, err_class=AccessTokenError)
     assert result == {'key': 'value'}
 
 
 def test_get_json_result_invalid_json():
-    mock_response = Mock()
-    mock_response.json.side_effect = json.JSONDecodeError('Invalid JSON', '', 0)
+    response = httpx.Response(200, content=b'Invalid JSON')
     with pytest.raises(AccessTokenError, match='Result serialization failed'):
-        OAuth20Base.get_json_result(mock_response, err_class=AccessTokenError)
+        OAuth20Base.get_json_result(response, err_class=AccessTokenError)
@@ -0,0 +1,250 @@
+import asyncio
+import time
+
+from email.utils import formatdate
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GiteeOAuth20, GitHubOAuth20, GoogleOAuth20, RateLimitTracker, TokenBucketLimiter
+from fastapi_oauth20.errors import OAuth20RequestError, RateLimitExceededError
+from fastapi_oauth20.ratelimit import RateLimitBudget, parse_retry_after
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GITHUB_USER_INFO_URL = 'https://api.github.com/user'
+GITEE_USER_INFO_URL = 'https://gitee.com/api/v5/user'
+GITHUB_TOKEN_URL = 'https://github.com/login/oauth/access_token'
+
+
+def rate_limit_headers(remaining: int, reset_in: float = 60) -> dict[str, str]:
+    return {
+        'X-RateLimit-Limit': '5000',
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(int(time.time() + reset_in)),
+    }
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after('-5') == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+
+def test_parse_retry_after_http_date():
+    now = time.time()
+    assert parse_retry_after(formatdate(now + 30, usegmt=True), now=now) == pytest.approx(30, abs=1)
+
+
+def test_budget_blocked_until():
+    now = time.time()
+    assert RateLimitBudget(remaining=10, reset_at=now + 60).blocked_until(now=now) is None
+    assert RateLimitBudget(remaining=0, reset_at=now + 60).blocked_until(now=now) == now + 60
+    assert RateLimitBudget(remaining=0, reset_at=now - 1).blocked_until(now=now) is None
+    assert RateLimitBudget(remaining=5, reset_at=now + 60).blocked_until(min_remaining=5, now=now) == now + 60
+    assert RateLimitBudget(retry_at=now + 30).blocked_until(now=now) == now + 30
+
+
+def test_tracker_update_and_snapshot():
+    tracker = RateLimitTracker()
+    tracker.update('app:test', httpx.Response(200, headers=rate_limit_headers(42)))
+    tracker.update('app:other', httpx.Response(200))
+    budget = tracker.get_budget('app:test')
+    assert budget.limit == 5000
+    assert budget.remaining == 42
+    assert tracker.get_budget('app:other') is None
+    assert tracker.snapshot() == {'app:test': budget}
+
+
+@pytest.mark.asyncio
+async def test_tracker_fails_fast_when_exhausted():
+    tracker = RateLimitTracker()
+    tracker.update('token:a', httpx.Response(403, headers=rate_limit_headers(0)))
+    await tracker.acquire('token:b')
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await tracker.acquire('token:a', 'app:test')
+    assert exc_info.value.retry_after == pytest.approx(60, abs=2)
+    assert isinstance(exc_info.value, OAuth20RequestError)
+
+
+@pytest.mark.asyncio
+async def test_tracker_delays_within_max_delay():
+    tracker = RateLimitTracker(max_delay=1)
+    tracker.update('app:test', httpx.Response(429, headers={'Retry-After': '0.05'}))
+    start = time.monotonic()
+    await tracker.acquire('app:test')
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_tracker_reserves_remaining_budget():
+    tracker = RateLimitTracker()
+    tracker.update('app:test', httpx.Response(200, headers=rate_limit_headers(2)))
+    results = await asyncio.gather(*(tracker.acquire('app:test') for _ in range(3)), return_exceptions=True)
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], RateLimitExceededError)
+    assert tracker.get_budget('app:test').remaining == 0
+
+
+def test_github_and_gitee_track_rate_limits_by_default():
+    assert isinstance(GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET).rate_limit_tracker, RateLimitTracker)
+    assert isinstance(GiteeOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET).rate_limit_tracker, RateLimitTracker)
+    assert GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET).rate_limit_tracker is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_github_exhausted_token_fails_before_request():
+    client = GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+    route = respx.get(GITHUB_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, json=create_mock_user_data('github'), headers=rate_limit_headers(0))
+    )
+    await client.get_userinfo(TEST_ACCESS_TOKEN)
+    with pytest.raises(RateLimitExceededError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.call_count == 1
+    await client.get_userinfo('other_token')
+    assert route.call_count == 2
+    assert len(client.rate_limit_tracker.snapshot()) == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_gitee_retry_after_blocks_token():
+    client = GiteeOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+    respx.get(GITEE_USER_INFO_URL).mock(return_value=httpx.Response(429, headers={'Retry-After': '30'}))
+    with pytest.raises(OAuth20RequestError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    with pytest.raises(RateLimitExceededError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_rejects():
+    limiter = TokenBucketLimiter(rate=1, burst=3, policy='reject')
+    for _ in range(3):
+        await limiter.acquire()
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.retry_after == pytest.approx(1, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_queues_requests_in_order():
+    limiter = TokenBucketLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    assert time.monotonic() - start >= 0.035
+    assert limiter.tokens < 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rejects_beyond_max_wait():
+    limiter = TokenBucketLimiter(rate=10, burst=1, max_wait=0.15)
+    await limiter.acquire()
+    queued = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.retry_after == pytest.approx(0.2, abs=0.05)
+    await queued
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refunds_cancelled_waiter():
+    limiter = TokenBucketLimiter(rate=10, burst=1)
+    await limiter.acquire()
+    task = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.tokens == pytest.approx(0, abs=0.1)
+
+
+def test_token_bucket_validation_and_sharing():
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(rate=0)
+    assert TokenBucketLimiter(rate=20).burst == 20
+    assert TokenBucketLimiter(rate=0.5).burst == 1
+    shared = TokenBucketLimiter.shared('shared_client_id', rate=5)
+    assert TokenBucketLimiter.shared('shared_client_id', rate=5, burst=5) is shared
+    assert TokenBucketLimiter.shared('other_client_id', rate=5) is not shared
+
+
+@pytest.mark.parametrize(
+    'options',
+    [{'rate': 10}, {'rate': 5, 'burst': 1}, {'rate': 5, 'policy': 'reject'}, {'rate': 5, 'max_wait': 1.0}],
+)
+def test_token_bucket_shared_rejects_mismatched_options(options):
+    shared = TokenBucketLimiter.shared('mismatched_client_id', rate=5)
+    with pytest.raises(ValueError, match='mismatched_client_id'):
+        TokenBucketLimiter.shared('mismatched_client_id', **options)
+    assert TokenBucketLimiter.shared('mismatched_client_id', rate=5) is shared
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_rate_limiter_rejects_before_request():
+    limiter = TokenBucketLimiter(rate=1, burst=1, policy='reject')
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, rate_limiter=limiter)
+    route = respx.get('https://www.googleapis.com/oauth2/v1/userinfo').mock(
+        return_value=httpx.Response(200, json=create_mock_user_data('google'))
+    )
+    await client.get_userinfo(TEST_ACCESS_TOKEN)
+    with pytest.raises(RateLimitExceededError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_unauthenticated_requests_do_not_block_app():
+    client = GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+    respx.head(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(401, headers=rate_limit_headers(0)))
+    token_route = respx.post(GITHUB_TOKEN_URL).mock(return_value=httpx.Response(200, json={'access_token': 'token'}))
+    await client.request('HEAD', GITHUB_USER_INFO_URL)
+    assert client.rate_limit_tracker.snapshot() == {}
+
+    await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    assert token_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_credential_requests_update_app_budget():
+    client = GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+    route = respx.post(GITHUB_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'token'}, headers=rate_limit_headers(0))
+    )
+    await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    assert client.rate_limit_tracker.get_budget(f'app:{TEST_CLIENT_ID}').remaining == 0
+    with pytest.raises(RateLimitExceededError):
+        await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_user_requests_do_not_consume_app_budget():
+    client = GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET)
+    respx.post(GITHUB_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'token'}, headers=rate_limit_headers(2))
+    )
+    respx.get(GITHUB_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, json=create_mock_user_data('github'), headers=rate_limit_headers(4999))
+    )
+    await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    for user in range(5):
+        await client.get_userinfo(f'token_{user}')
+    assert client.rate_limit_tracker.get_budget(f'app:{TEST_CLIENT_ID}').remaining == 2
+
+
+@pytest.mark.asyncio
+async def test_app_budget_gates_user_requests():
+    tracker = RateLimitTracker()
+    tracker.update('app:test', httpx.Response(403, headers=rate_limit_headers(0)))
+    with pytest.raises(RateLimitExceededError):
+        await tracker.acquire('token:a', 'app:test')
+    assert tracker.get_budget('token:a') is None
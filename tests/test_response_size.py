@@ -0,0 +1,166 @@
+import gzip
+import json
+
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GitHubOAuth20, GoogleOAuth20
+from fastapi_oauth20.errors import ResponseTooLargeError
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+GITHUB_USER_INFO_URL = 'https://api.github.com/user'
+GITHUB_EMAILS_URL = 'https://api.github.com/user/emails'
+
+MAX_RESPONSE_SIZE = 1024
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """Response body of unknown length, counting the chunks the client pulled."""
+
+    def __init__(self, chunk: bytes, count: int) -> None:
+        self.chunk = chunk
+        self.count = count
+        self.sent = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for _ in range(self.count):
+            self.sent += 1
+            yield self.chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def google_client():
+    return GoogleOAuth20(
+        client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET, max_response_size=MAX_RESPONSE_SIZE
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_response_within_limit(google_client):
+    userinfo = create_mock_user_data('google')
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, json=userinfo))
+    assert await google_client.get_userinfo(TEST_ACCESS_TOKEN) == userinfo
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_response_exactly_at_limit(google_client):
+    body = json.dumps({'padding': 'x' * (MAX_RESPONSE_SIZE - 15)}).encode()
+    assert len(body) == MAX_RESPONSE_SIZE
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, content=body))
+    assert await google_client.get_userinfo(TEST_ACCESS_TOKEN) == json.loads(body)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_oversized_content_length_rejected_before_reading(google_client):
+    body = ChunkedBody(b'x' * 256, 64)
+    respx.get(GOOGLE_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, headers={'Content-Length': str(256 * 64)}, stream=body)
+    )
+    with pytest.raises(ResponseTooLargeError, match='Content-Length'):
+        await google_client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert body.sent == 0
+    assert body.closed
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_oversized_chunked_response_aborted_early(google_client):
+    body = ChunkedBody(b'x' * 256, 10_000)
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, stream=body))
+    with pytest.raises(ResponseTooLargeError) as exc_info:
+        await google_client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert body.sent == MAX_RESPONSE_SIZE // 256 + 1
+    assert body.closed
+    assert exc_info.value.response is not None
+    assert exc_info.value.response.status_code == 200
+    assert exc_info.value.response.is_closed
+    with pytest.raises(httpx.ResponseNotRead):
+        exc_info.value.response.content
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_oversized_token_response(google_client):
+    respx.post(GOOGLE_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'x' * 2 * MAX_RESPONSE_SIZE})
+    )
+    with pytest.raises(ResponseTooLargeError):
+        await google_client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_limit_applies_to_decoded_body(google_client):
+    content = gzip.compress(json.dumps({'padding': ' ' * 100 * MAX_RESPONSE_SIZE}).encode())
+    assert len(content) < MAX_RESPONSE_SIZE
+    respx.get(GOOGLE_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, headers={'Content-Encoding': 'gzip'}, content=content)
+    )
+    with pytest.raises(ResponseTooLargeError):
+        await google_client.get_userinfo(TEST_ACCESS_TOKEN)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_compressed_response_within_limit(google_client):
+    userinfo = create_mock_user_data('google')
+    respx.get(GOOGLE_USER_INFO_URL).mock(
+        return_value=httpx.Response(
+            200, headers={'Content-Encoding': 'gzip'}, content=gzip.compress(json.dumps(userinfo).encode())
+        )
+    )
+    response = await google_client.request('GET', GOOGLE_USER_INFO_URL)
+    assert response.json() == userinfo
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Content-Length'] == str(len(response.content))
+    assert response.elapsed.total_seconds() >= 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_bounded_request_accepts_client_kwargs(google_client):
+    userinfo = create_mock_user_data('google')
+    respx.get(GOOGLE_USER_INFO_URL).mock(
+        return_value=httpx.Response(302, headers={'Location': 'https://www.googleapis.com/oauth2/v2/userinfo'})
+    )
+    respx.get('https://www.googleapis.com/oauth2/v2/userinfo').mock(return_value=httpx.Response(200, json=userinfo))
+    response = await google_client.request(
+        'GET', GOOGLE_USER_INFO_URL, follow_redirects=True, auth=httpx.BasicAuth('user', 'secret')
+    )
+    assert response.json() == userinfo
+    assert len(response.history) == 1
+    assert response.request.headers['Authorization'].startswith('Basic ')
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_limit_applies_to_github_emails():
+    client = GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET, max_response_size=1024)
+    respx.get(GITHUB_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, json=create_mock_user_data('github', email=None))
+    )
+    emails = [{'email': f'user{i}@example.com', 'primary': False} for i in range(100)]
+    respx.get(GITHUB_EMAILS_URL).mock(return_value=httpx.Response(200, json=emails))
+    with pytest.raises(ResponseTooLargeError):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_unbounded_by_default():
+    client = GoogleOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+    userinfo = {'padding': 'x' * 1024 * 1024}
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, json=userinfo))
+    assert await client.get_userinfo(TEST_ACCESS_TOKEN) == userinfo
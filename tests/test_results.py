@@ -0,0 +1,144 @@
+import copy
+import json
+import pickle
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GitHubOAuth20, GoogleOAuth20, TokenManager, TokenResponse, UserInfo, WeChatOpenOAuth20
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GITHUB_USER_INFO_URL = 'https://api.github.com/user'
+WECHAT_OPEN_TOKEN_URL = 'https://api.weixin.qq.com/sns/oauth2/access_token'
+
+
+def test_token_response_typed_fields():
+    token = TokenResponse(
+        {
+            'access_token': 'access',
+            'token_type': 'Bearer',
+            'expires_in': '3600',
+            'refresh_token': 'refresh',
+            'scope': 'openid email',
+            'id_token': 'id',
+        },
+        issued_at=1000.0,
+    )
+    assert token.access_token == 'access'
+    assert token.token_type == 'Bearer'
+    assert token.expires_in == 3600
+    assert token.expires_at == 4600.0
+    assert token.refresh_token == 'refresh'
+    assert token.scope == 'openid email'
+    assert token.id_token == 'id'
+    assert token.openid is None
+
+
+def test_token_response_prefers_stored_expires_at():
+    token = TokenResponse({'access_token': 'access', 'expires_in': 3600, 'expires_at': 2000}, issued_at=1000.0)
+    assert token.expires_at == 2000.0
+
+
+def test_token_response_without_expiry():
+    token = TokenResponse({'access_token': 'access'})
+    assert token.expires_in is None
+    assert token.expires_at is None
+
+
+def test_token_response_is_a_slotted_dict():
+    data = {'access_token': 'access', 'expires_in': 3600}
+    token = TokenResponse(data, issued_at=1000.0)
+    assert token == data
+    assert json.loads(json.dumps(token)) == data
+    assert not hasattr(token, '__dict__')
+    with pytest.raises(AttributeError):
+        token.extra = 'value'
+
+
+@pytest.mark.parametrize('clone', [copy.copy, copy.deepcopy, lambda token: pickle.loads(pickle.dumps(token))])
+def test_token_response_copy_keeps_issued_at(clone):
+    token = TokenResponse({'access_token': 'access', 'expires_in': 60}, issued_at=1000.0)
+    cloned = clone(token)
+    assert isinstance(cloned, TokenResponse)
+    assert cloned == token
+    assert cloned.expires_at == 1060.0
+
+
+@pytest.mark.parametrize(
+    ('data', 'expected_id', 'expected_name', 'expected_avatar'),
+    [
+        ({'id': 123, 'login': 'octocat', 'avatar_url': 'https://a/1'}, '123', 'octocat', 'https://a/1'),
+        ({'id': '42', 'name': 'Jane', 'picture': 'https://a/2'}, '42', 'Jane', 'https://a/2'),
+        ({'openid': 'o6_bm', 'nickname': '微信用户', 'headimgurl': 'https://a/3'}, 'o6_bm', '微信用户', 'https://a/3'),
+        (
+            {'sub': 'ou_1', 'open_id': 'ou_1', 'name': '张三', 'avatar_url': 'https://a/4'},
+            'ou_1',
+            '张三',
+            'https://a/4',
+        ),
+        ({'id': 7, 'name': None, 'username': 'linux', 'avatar': 'https://a/5'}, '7', 'linux', 'https://a/5'),
+    ],
+)
+def test_userinfo_typed_fields(data, expected_id, expected_name, expected_avatar):
+    userinfo = UserInfo(data)
+    assert userinfo == data
+    assert userinfo.id == expected_id
+    assert userinfo.name == expected_name
+    assert userinfo.avatar_url == expected_avatar
+    assert not hasattr(userinfo, '__dict__')
+
+
+def test_userinfo_missing_fields():
+    userinfo = UserInfo({})
+    assert userinfo.id is None
+    assert userinfo.name is None
+    assert userinfo.email is None
+    assert userinfo.avatar_url is None
+    assert userinfo.unionid is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_access_token_returns_token_response():
+    respx.post(GOOGLE_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'access', 'expires_in': 3600, 'token_type': 'Bearer'})
+    )
+    client = GoogleOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+    token = await client.get_access_token(code='code', redirect_uri='https://example.com/callback')
+    assert isinstance(token, TokenResponse)
+    assert token.access_token == 'access'
+    assert token.expires_at == pytest.approx(token.issued_at + 3600)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_wechat_token_response_openid():
+    respx.get(WECHAT_OPEN_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'access', 'openid': 'o6_bm', 'unionid': 'o6_union'})
+    )
+    client = WeChatOpenOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+    token = await client.get_access_token(code='code')
+    assert token.openid == 'o6_bm'
+    assert token.unionid == 'o6_union'
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_userinfo_returns_userinfo():
+    respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(200, json=create_mock_user_data('github')))
+    client = GitHubOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET)
+    userinfo = await client.get_userinfo(TEST_ACCESS_TOKEN)
+    assert isinstance(userinfo, UserInfo)
+    assert userinfo == create_mock_user_data('github')
+    assert userinfo.email == userinfo['email']
+
+
+@pytest.mark.asyncio
+async def test_token_manager_uses_issued_at():
+    manager = TokenManager(GoogleOAuth20(client_id=TEST_CLIENT_ID, client_secret=TEST_CLIENT_SECRET))
+    token = TokenResponse({'access_token': 'access', 'expires_in': 3600, 'refresh_token': 'refresh'}, issued_at=1000.0)
+    stored = await manager.set_token('user', token)
+    assert stored['expires_at'] == 4600.0
+    assert isinstance(stored, TokenResponse)
@@ -0,0 +1,154 @@
+import httpx
+import pytest
+
+from fastapi_oauth20 import FeiShuOAuth20, RetryPolicy, WeChatOpenOAuth20
+from fastapi_oauth20.errors import AccessTokenError, HTTPXOAuth20Error
+from fastapi_oauth20.oauth20 import OAuth20Base
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+FAST_POLICY = RetryPolicy(max_attempts=3, backoff_base=0)
+
+
+class FaultInjectingTransport(httpx.AsyncBaseTransport):
+    """Mock transport failing the first requests with the given faults, then answering with the handler."""
+
+    def __init__(self, faults: list[Exception | httpx.Response], response: httpx.Response) -> None:
+        self.faults = list(faults)
+        self.response = response
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.faults:
+            fault = self.faults.pop(0)
+            if isinstance(fault, Exception):
+                raise fault
+            return fault
+        return self.response
+
+
+def with_transport(client: OAuth20Base, transport: FaultInjectingTransport) -> OAuth20Base:
+    client.create_http_client = lambda: httpx.AsyncClient(transport=transport)
+    return client
+
+
+def feishu_client(transport: FaultInjectingTransport, policy: RetryPolicy | None = FAST_POLICY) -> OAuth20Base:
+    return with_transport(FeiShuOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, retry_policy=policy), transport)
+
+
+def test_is_retryable():
+    policy = RetryPolicy()
+    assert policy.is_retryable('get')
+    assert not policy.is_retryable('POST')
+    assert policy.is_retryable('POST', idempotent=True)
+    assert not policy.is_retryable('GET', idempotent=False)
+    assert not RetryPolicy(max_attempts=1).is_retryable('GET')
+
+
+def test_get_delay_full_jitter():
+    policy = RetryPolicy(backoff_base=1, backoff_max=3)
+    assert all(0 <= policy.get_delay(1) <= 1 for _ in range(100))
+    assert all(0 <= policy.get_backoff(5) <= 3 for _ in range(100))
+    assert policy.get_delay(3) is None
+
+
+def test_get_delay_by_response():
+    policy = RetryPolicy(max_retry_after=10)
+    assert policy.get_delay(1, httpx.Response(400)) is None
+    assert policy.get_delay(1, httpx.Response(503, headers={'Retry-After': '7'})) == 7
+    assert policy.get_delay(1, httpx.Response(429, headers={'Retry-After': '60'})) is None
+    assert RetryPolicy(respect_retry_after=False, backoff_base=0).get_delay(1, httpx.Response(429)) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_userinfo_retries_transient_failures():
+    transport = FaultInjectingTransport(
+        [httpx.ConnectError('Connection reset'), httpx.Response(502)],
+        httpx.Response(200, json=create_mock_user_data('feishu')),
+    )
+    result = await feishu_client(transport).get_userinfo(TEST_ACCESS_TOKEN)
+    assert result == create_mock_user_data('feishu')
+    assert len(transport.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_userinfo_gives_up_after_max_attempts():
+    transport = FaultInjectingTransport([httpx.Response(503)] * 3, httpx.Response(200, json={}))
+    with pytest.raises(HTTPXOAuth20Error):
+        await feishu_client(transport).get_userinfo(TEST_ACCESS_TOKEN)
+    assert len(transport.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_userinfo_reraises_transport_error_after_max_attempts():
+    transport = FaultInjectingTransport([httpx.ReadError('Connection reset')] * 3, httpx.Response(200, json={}))
+    with pytest.raises(httpx.ReadError):
+        await feishu_client(transport).get_userinfo(TEST_ACCESS_TOKEN)
+    assert len(transport.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_userinfo_does_not_retry_client_errors():
+    transport = FaultInjectingTransport([httpx.Response(401)], httpx.Response(200, json={}))
+    with pytest.raises(HTTPXOAuth20Error):
+        await feishu_client(transport).get_userinfo(TEST_ACCESS_TOKEN)
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_retry_without_policy():
+    transport = FaultInjectingTransport([httpx.Response(503)], httpx.Response(200, json={}))
+    with pytest.raises(HTTPXOAuth20Error):
+        await feishu_client(transport, policy=None).get_userinfo(TEST_ACCESS_TOKEN)
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_is_retried():
+    transport = FaultInjectingTransport([httpx.Response(503)], httpx.Response(200))
+    client = OAuth20Base(
+        TEST_CLIENT_ID,
+        TEST_CLIENT_SECRET,
+        authorize_endpoint='https://example.com/authorize',
+        access_token_endpoint='https://example.com/token',
+        userinfo_endpoint='https://example.com/userinfo',
+        revoke_token_endpoint='https://example.com/revoke',
+        retry_policy=FAST_POLICY,
+    )
+    await with_transport(client, transport).revoke_token('token')
+    assert len(transport.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_access_token_exchange_is_never_retried():
+    transport = FaultInjectingTransport([httpx.Response(503)], httpx.Response(200, json={'access_token': 'token'}))
+    with pytest.raises(HTTPXOAuth20Error):
+        await feishu_client(transport).get_access_token('code', 'https://example.com/callback')
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_wechat_access_token_exchange_is_never_retried():
+    transport = FaultInjectingTransport([httpx.ConnectError('Connection reset')], httpx.Response(200, json={}))
+    client = with_transport(
+        WeChatOpenOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, retry_policy=RetryPolicy(backoff_base=0)), transport
+    )
+    with pytest.raises((httpx.ConnectError, AccessTokenError)):
+        await client.get_access_token('code')
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_honours_retry_after(monkeypatch):
+    delays = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr('fastapi_oauth20.oauth20.asyncio.sleep', sleep)
+    transport = FaultInjectingTransport(
+        [httpx.Response(429, headers={'Retry-After': '2'})], httpx.Response(200, json={'user_id': 'test'})
+    )
+    result = await feishu_client(transport, policy=RetryPolicy()).get_userinfo(TEST_ACCESS_TOKEN)
+    assert result == {'user_id': 'test'}
+    assert delays == [2]
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GoogleOAuth20, RequestScheduler, priority
+from fastapi_oauth20.scheduler import current_priority
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+GOOGLE_USER_INFO_URL = 'https://www.googleapis.com/oauth2/v1/userinfo'
+
+
+def test_priority_context():
+    assert current_priority() is None
+    with priority('batch'):
+        assert current_priority() == 'batch'
+        with priority('interactive'):
+            assert current_priority() == 'interactive'
+        assert current_priority() == 'batch'
+    assert current_priority() is None
+
+
+@pytest.mark.asyncio
+async def test_admits_by_priority_class():
+    scheduler = RequestScheduler(max_concurrency=1)
+    order = []
+
+    async def send(name: str) -> None:
+        async with scheduler.slot(name):
+            order.append(name)
+
+    await scheduler.acquire('batch')
+    tasks = [asyncio.ensure_future(send(name)) for name in ('batch', 'refresh', 'batch', 'interactive')]
+    await asyncio.sleep(0)
+    assert scheduler.stats()['batch'].queued == 2
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    assert order == ['interactive', 'refresh', 'batch', 'batch']
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_bounds_in_flight_requests():
+    scheduler = RequestScheduler(max_concurrency=2)
+    peak = 0
+
+    async def send() -> None:
+        nonlocal peak
+        async with scheduler.slot('interactive'):
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(*(send() for _ in range(10)))
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = RequestScheduler(max_concurrency=1)
+    await scheduler.acquire('interactive')
+    cancelled = asyncio.ensure_future(scheduler.acquire('batch'))
+    waiting = asyncio.ensure_future(scheduler.acquire('batch'))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.stats()['batch'].queued == 1
+    scheduler.release()
+    await waiting
+    scheduler.release()
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_record_wait_time():
+    scheduler = RequestScheduler(max_concurrency=1)
+    await scheduler.acquire('interactive')
+    waiting = asyncio.ensure_future(scheduler.acquire('batch'))
+    await asyncio.sleep(0.02)
+    scheduler.release()
+    await waiting
+    stats = scheduler.stats()
+    assert stats['interactive'].admitted == 1
+    assert stats['interactive'].max_wait == 0
+    assert stats['batch'].admitted == 1
+    assert stats['batch'].max_wait >= 0.015
+    assert stats['batch'].mean_wait == stats['batch'].max_wait
+    assert stats['refresh'].mean_wait == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_priority_class():
+    with pytest.raises(ValueError):
+        await RequestScheduler().acquire('urgent')
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_requests_use_context_priority():
+    scheduler = RequestScheduler()
+    client = GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET, scheduler=scheduler)
+    respx.get(GOOGLE_USER_INFO_URL).mock(return_value=httpx.Response(200, json=create_mock_user_data('google')))
+    respx.post(GOOGLE_TOKEN_URL).mock(return_value=httpx.Response(200, json={'access_token': 'new_token'}))
+
+    await client.get_userinfo(TEST_ACCESS_TOKEN)
+    await client.refresh_token('refresh_token')
+    with priority('batch'):
+        await client.get_userinfo(TEST_ACCESS_TOKEN)
+        await client.refresh_token('other_refresh_token')
+
+    stats = scheduler.stats()
+    assert stats['interactive'].admitted == 1
+    assert stats['refresh'].admitted == 1
+    assert stats['batch'].admitted == 2
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from fastapi_oauth20.singleflight import SingleFlight
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    counter = Counter()
+    results = await asyncio.gather(*(flight.do('key', counter) for _ in range(10)))
+    assert results == [1] * 10
+    assert counter.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    counter = Counter()
+    await asyncio.gather(flight.do('key1', counter), flight.do('key2', counter))
+    assert counter.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_without_share_window():
+    flight = SingleFlight()
+    counter = Counter()
+    assert await flight.do('key', counter) == 1
+    assert await flight.do('key', counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_share_window_reuses_completed_result():
+    flight = SingleFlight(share_window=0.05)
+    counter = Counter()
+    assert await flight.do('key', counter) == 1
+    assert await flight.do('key', counter) == 1
+    await asyncio.sleep(0.06)
+    assert await flight.do('key', counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight(share_window=10)
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    results = await asyncio.gather(*(flight.do('key', fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == 1
+    with pytest.raises(ValueError):
+        await flight.do('key', fail)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+    counter = Counter()
+    first = asyncio.ensure_future(flight.do('key', counter))
+    second = asyncio.ensure_future(flight.do('key', counter))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 1
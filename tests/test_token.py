@@ -0,0 +1,119 @@
+import time
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GiteeOAuth20, GoogleOAuth20, TokenManager
+from fastapi_oauth20.cache import SQLiteCache
+from tests.conftest import TEST_CLIENT_ID, TEST_CLIENT_SECRET
+
+GOOGLE_TOKEN_URL = 'https://oauth2.googleapis.com/token'
+
+
+@pytest.fixture
+def manager():
+    return TokenManager(GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET), skew=60)
+
+
+def test_with_expires_at():
+    token = TokenManager.with_expires_at({'access_token': 'a', 'expires_in': 3600}, now=1000)
+    assert token['expires_at'] == 4600
+    assert 'expires_at' not in TokenManager.with_expires_at({'access_token': 'a'})
+
+
+@pytest.mark.asyncio
+async def test_get_token_missing(manager):
+    assert await manager.get_token('user') is None
+
+
+@pytest.mark.asyncio
+async def test_get_token_returns_cached_valid_token(manager):
+    stored = await manager.set_token('user', {'access_token': 'a', 'expires_in': 3600, 'refresh_token': 'r'})
+    assert await manager.get_token('user') == stored
+    assert stored['expires_at'] == pytest.approx(time.time() + 3600, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_get_token_without_expiry_never_refreshes(manager):
+    await manager.set_token('user', {'access_token': 'a'})
+    assert await manager.get_token('user') == {'access_token': 'a'}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_token_refreshes_in_skew_window(manager):
+    route = respx.post(GOOGLE_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'new', 'expires_in': 3600})
+    )
+    await manager.set_token('user', {'access_token': 'old', 'expires_in': 30, 'refresh_token': 'r'})
+    token = await manager.get_token('user')
+    assert token['access_token'] == 'new'
+    assert token['refresh_token'] == 'r'
+    assert route.call_count == 1
+    assert 'refresh_token=r' in route.calls[0].request.content.decode()
+    assert await manager.get_token('user') == token
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_token_keeps_rotated_refresh_token(manager):
+    respx.post(GOOGLE_TOKEN_URL).mock(
+        return_value=httpx.Response(200, json={'access_token': 'new', 'expires_in': 3600, 'refresh_token': 'r2'})
+    )
+    await manager.set_token('user', {'access_token': 'old', 'expires_in': 0, 'refresh_token': 'r1'})
+    token = await manager.get_token('user')
+    assert token['refresh_token'] == 'r2'
+
+
+@pytest.mark.asyncio
+async def test_get_token_in_skew_window_without_refresh_token(manager):
+    stored = await manager.set_token('user', {'access_token': 'old', 'expires_in': 30})
+    assert await manager.get_token('user') == stored
+
+
+@pytest.mark.asyncio
+async def test_get_token_expired_without_refresh_token(manager, monkeypatch):
+    await manager.set_token('user', {'access_token': 'old', 'expires_in': 3600, 'refresh_token': 'r'})
+    manager.client.refresh_token_endpoint = None
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 3601)
+    assert await manager.get_token('user') is None
+    assert await manager.backend.get(manager.make_key('user')) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_exchange_stores_token(manager):
+    respx.post(GOOGLE_TOKEN_URL).mock(return_value=httpx.Response(200, json={'access_token': 'a', 'expires_in': 3600}))
+    token = await manager.exchange('user', 'code', redirect_uri='https://example.com/callback')
+    assert token['access_token'] == 'a'
+    assert await manager.get_token('user') == token
+
+
+@pytest.mark.asyncio
+async def test_delete_token(manager):
+    await manager.set_token('user', {'access_token': 'a'})
+    await manager.delete_token('user')
+    assert await manager.get_token('user') is None
+
+
+@pytest.mark.asyncio
+async def test_bounded_size():
+    manager = TokenManager(GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET), maxsize=2)
+    for key in ('a', 'b', 'c'):
+        await manager.set_token(key, {'access_token': key})
+    assert len(manager.backend.cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_namespaced_per_client(tmp_path):
+    backend = SQLiteCache(str(tmp_path / 'cache.db'))
+    google = TokenManager(GoogleOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET), backend=backend)
+    gitee = TokenManager(GiteeOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET), backend=backend)
+    await google.set_token('user', {'access_token': 'google'})
+    await gitee.set_token('user', {'access_token': 'gitee'})
+    assert (await google.get_token('user'))['access_token'] == 'google'
+    assert (await gitee.get_token('user'))['access_token'] == 'gitee'
+    await backend.aclose()
@@ -0,0 +1,196 @@
+import ssl
+
+from pathlib import Path
+
+import certifi
+import httpcore
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GitHubOAuth20, TransportRegistry, WeChatOpenOAuth20
+from fastapi_oauth20.transport import DEFAULT_LIMITS, default_transport_registry, get_ssl_context, is_http2_available
+
+
+@pytest.fixture
+def registry():
+    return TransportRegistry()
+
+
+def test_clients_use_default_registry():
+    client = GitHubOAuth20('client_id', 'client_secret')
+    assert client.transport_registry is default_transport_registry
+
+
+def test_get_transport_is_shared_per_host(registry):
+    transport = registry.get_transport('api.github.com')
+    assert registry.get_transport('api.github.com') is transport
+    assert registry.get_transport('api.weixin.qq.com') is not transport
+
+
+def test_set_limits_per_host(registry):
+    limits = httpx.Limits(max_connections=5, max_keepalive_connections=2)
+    registry.set_limits('api.weixin.qq.com', limits)
+    assert registry.get_limits('api.weixin.qq.com') == limits
+    assert registry.get_limits('github.com') == DEFAULT_LIMITS
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_clients_share_pool_of_same_host(registry):
+    respx.get('https://api.weixin.qq.com/sns/userinfo').mock(return_value=httpx.Response(200, json={'openid': 'o'}))
+    client1 = WeChatOpenOAuth20('app1', 'secret1', transport_registry=registry)
+    client2 = WeChatOpenOAuth20('app2', 'secret2', transport_registry=registry)
+    await client1.get_userinfo('token1', openid='o')
+    await client2.get_userinfo('token2', openid='o')
+    assert list(registry._transports) == [('api.weixin.qq.com', False, None)]
+
+
+@pytest.mark.asyncio
+async def test_closing_client_keeps_shared_pool_open(registry):
+    client = GitHubOAuth20('client_id', 'client_secret', transport_registry=registry)
+    transport = registry.get_transport('api.github.com')
+    async with client:
+        client.http_client
+    assert registry.get_transport('api.github.com') is transport
+
+
+@pytest.mark.asyncio
+async def test_registry_aclose_releases_pools(registry):
+    transport = registry.get_transport('api.github.com')
+    await registry.aclose()
+    assert registry.get_transport('api.github.com') is not transport
+
+
+def test_get_ssl_context_is_cached():
+    assert get_ssl_context() is get_ssl_context()
+
+
+def test_get_ssl_context_honours_ssl_cert_env(monkeypatch, tmp_path):
+    cafile = tmp_path / 'ca.pem'
+    cafile.write_text(Path(certifi.where()).read_text())
+    monkeypatch.setenv('SSL_CERT_FILE', str(cafile))
+    assert get_ssl_context() is get_ssl_context(cafile=str(cafile))
+    assert get_ssl_context() is not get_ssl_context(trust_env=False)
+
+    monkeypatch.delenv('SSL_CERT_FILE')
+    monkeypatch.setenv('SSL_CERT_DIR', str(tmp_path))
+    assert get_ssl_context().get_ca_certs() == []
+    assert get_ssl_context(trust_env=False).get_ca_certs() != []
+    transport = TransportRegistry(trust_env=False).get_transport('api.github.com')
+    assert transport._pool._ssl_context is get_ssl_context(trust_env=False)
+
+
+def test_registry_transports_share_ssl_context(registry):
+    transport1 = registry.get_transport('api.github.com')
+    transport2 = registry.get_transport('api.weixin.qq.com')
+    assert transport1._pool._ssl_context is get_ssl_context()
+    assert transport2._pool._ssl_context is get_ssl_context()
+
+
+def test_registry_custom_ssl_context():
+    context = ssl.create_default_context()
+    registry = TransportRegistry(ssl_context=context)
+    assert registry.get_transport('api.github.com')._pool._ssl_context is context
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr('fastapi_oauth20.oauth20.is_http2_available', lambda: False)
+    with pytest.warns(UserWarning, match='HTTP/2 requires the h2 package'):
+        client = GitHubOAuth20('client_id', 'client_secret', http2=True)
+    assert client.http2 is False
+
+
+@pytest.mark.skipif(not is_http2_available(), reason='h2 is not installed')
+def test_http2_pools_are_separate(registry):
+    http1_transport = registry.get_transport('api.github.com')
+    http2_transport = registry.get_transport('api.github.com', http2=True)
+    assert http1_transport is not http2_transport
+    assert http2_transport._pool._http2 is True
+
+
+@pytest.mark.skipif(not is_http2_available(), reason='h2 is not installed')
+@pytest.mark.asyncio
+@respx.mock
+async def test_http2_client_uses_http2_pool(registry):
+    respx.get('https://api.github.com/user').mock(return_value=httpx.Response(200, json={'email': 'e@example.com'}))
+    client = GitHubOAuth20('client_id', 'client_secret', transport_registry=registry, http2=True)
+    assert client.http2 is True
+    await client.get_userinfo('token')
+    assert list(registry._transports) == [('api.github.com', True, None)]
+
+
+def test_env_proxy_is_honoured(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.example.com:3128')
+    monkeypatch.setenv('NO_PROXY', 'api.weixin.qq.com')
+    registry = TransportRegistry()
+    proxy = registry.get_proxy(httpx.URL('https://api.github.com/user'))
+    assert proxy is not None
+    assert proxy.url == httpx.URL('http://proxy.example.com:3128')
+    assert registry.get_proxy(httpx.URL('https://api.weixin.qq.com/sns/userinfo')) is None
+    assert isinstance(registry.get_transport('api.github.com', proxy=proxy)._pool, httpcore.AsyncHTTPProxy)
+
+
+@pytest.mark.parametrize(
+    ('no_proxy', 'url', 'proxied'),
+    [
+        ('example.com', 'https://example.com/token', False),
+        ('example.com', 'https://api.example.com/token', False),
+        ('example.com', 'https://apiexample.com/token', True),
+        ('.example.com', 'https://example.com/token', True),
+        ('.example.com', 'https://api.example.com/token', False),
+        ('localhost', 'http://localhost:8000/token', False),
+        ('127.0.0.1', 'http://127.0.0.1:8000/token', False),
+        ('::1', 'http://[::1]:8000/token', False),
+        ('https://api.example.com', 'https://api.example.com/token', False),
+        ('https://api.example.com', 'http://api.example.com/token', True),
+        ('*', 'https://api.github.com/user', False),
+    ],
+)
+def test_env_no_proxy_patterns(monkeypatch, no_proxy, url, proxied):
+    for name in ('HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY', 'NO_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.lower(), raising=False)
+    monkeypatch.setenv('ALL_PROXY', 'proxy.example.com:3128')
+    monkeypatch.setenv('NO_PROXY', no_proxy)
+    proxy = TransportRegistry().get_proxy(httpx.URL(url))
+    assert (proxy is not None) is proxied
+    if proxied:
+        assert proxy.url == httpx.URL('http://proxy.example.com:3128')
+
+
+def test_env_proxy_prefers_specific_scheme(monkeypatch):
+    monkeypatch.setenv('ALL_PROXY', 'http://all.example.com:3128')
+    monkeypatch.setenv('HTTPS_PROXY', 'http://https.example.com:3128')
+    registry = TransportRegistry()
+    assert registry.get_proxy(httpx.URL('https://api.github.com/user')).url.host == 'https.example.com'
+    assert registry.get_proxy(httpx.URL('http://api.github.com/user')).url.host == 'all.example.com'
+
+
+@pytest.mark.asyncio
+async def test_client_sends_through_env_proxy(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.example.com:3128')
+    registry = TransportRegistry()
+    client = GitHubOAuth20('client_id', 'client_secret', transport_registry=registry)
+    with respx.mock:
+        respx.get('https://api.github.com/user').mock(return_value=httpx.Response(200, json={'email': 'e@example.com'}))
+        await client.get_userinfo('token')
+    [(key, transport)] = registry._transports.items()
+    assert key[0] == 'api.github.com'
+    assert key[2] is not None
+    assert isinstance(transport._pool, httpcore.AsyncHTTPProxy)
+
+
+def test_explicit_proxy_overrides_env(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.example.com:3128')
+    registry = TransportRegistry(proxy='http://egress.internal:8080')
+    proxy = registry.get_proxy(httpx.URL('https://api.github.com/user'))
+    assert proxy is registry.proxy
+    assert proxy.url == httpx.URL('http://egress.internal:8080')
+
+
+def test_env_proxy_ignored_without_trust_env(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://proxy.example.com:3128')
+    registry = TransportRegistry(trust_env=False)
+    assert registry.get_proxy(httpx.URL('https://api.github.com/user')) is None
+    assert isinstance(registry.get_transport('api.github.com')._pool, httpcore.AsyncConnectionPool)
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from fastapi_oauth20 import GitHubOAuth20, UserInfoCache, WeChatOpenOAuth20
+from fastapi_oauth20.errors import HTTPXOAuth20Error
+from tests.conftest import TEST_ACCESS_TOKEN, TEST_CLIENT_ID, TEST_CLIENT_SECRET, create_mock_user_data
+
+GITHUB_USER_INFO_URL = 'https://api.github.com/user'
+WECHAT_USER_INFO_URL = 'https://api.weixin.qq.com/sns/userinfo'
+
+
+@pytest.fixture
+def github_cache():
+    return UserInfoCache(GitHubOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET), ttl=60, stale_ttl=60)
+
+
+def advance(monkeypatch, seconds):
+    now, monotonic_now = time.time(), time.monotonic()
+    monkeypatch.setattr(time, 'time', lambda: now + seconds)
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic_now + seconds)
+
+
+def test_make_key_hashes_token_and_arguments():
+    key = UserInfoCache.make_key(TEST_ACCESS_TOKEN, openid='o1')
+    assert TEST_ACCESS_TOKEN not in key
+    assert key == UserInfoCache.make_key(TEST_ACCESS_TOKEN, openid='o1')
+    assert key != UserInfoCache.make_key(TEST_ACCESS_TOKEN, openid='o2')
+    assert key != UserInfoCache.make_key(TEST_ACCESS_TOKEN)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fresh_userinfo_is_cached(github_cache):
+    user_data = create_mock_user_data('github')
+    route = respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(200, json=user_data))
+    assert await github_cache.get_userinfo(TEST_ACCESS_TOKEN) == user_data
+    result = await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    assert result == user_data
+    assert route.call_count == 1
+    result['email'] = 'changed@example.com'
+    assert (await github_cache.get_userinfo(TEST_ACCESS_TOKEN))['email'] == user_data['email']
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_misses_fetch_once(github_cache):
+    route = respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(200, json=create_mock_user_data('github')))
+    await asyncio.gather(*(github_cache.get_userinfo(TEST_ACCESS_TOKEN) for _ in range(5)))
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stale_userinfo_is_revalidated_in_background(github_cache, monkeypatch):
+    route = respx.get(GITHUB_USER_INFO_URL).mock(
+        side_effect=[
+            httpx.Response(200, json=create_mock_user_data('github', name='Old Name')),
+            httpx.Response(200, json=create_mock_user_data('github', name='New Name')),
+        ]
+    )
+    await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    advance(monkeypatch, 90)
+    assert (await github_cache.get_userinfo(TEST_ACCESS_TOKEN))['name'] == 'Old Name'
+    await asyncio.gather(*github_cache._revalidations)
+    assert (await github_cache.get_userinfo(TEST_ACCESS_TOKEN))['name'] == 'New Name'
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_revalidation_keeps_stale_userinfo(github_cache, monkeypatch):
+    respx.get(GITHUB_USER_INFO_URL).mock(
+        side_effect=[
+            httpx.Response(200, json=create_mock_user_data('github')),
+            httpx.Response(503),
+        ]
+    )
+    user_data = await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    advance(monkeypatch, 90)
+    assert await github_cache.get_userinfo(TEST_ACCESS_TOKEN) == user_data
+    await asyncio.gather(*github_cache._revalidations)
+    assert await github_cache.get_userinfo(TEST_ACCESS_TOKEN) == user_data
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_expired_userinfo_is_fetched_again(github_cache, monkeypatch):
+    route = respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(401))
+    with pytest.raises(HTTPXOAuth20Error):
+        await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    route.mock(return_value=httpx.Response(200, json=create_mock_user_data('github')))
+    await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    advance(monkeypatch, 121)
+    await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_wechat_userinfo_keyed_by_openid():
+    cache = UserInfoCache(WeChatOpenOAuth20(TEST_CLIENT_ID, TEST_CLIENT_SECRET))
+    route = respx.get(WECHAT_USER_INFO_URL).mock(
+        return_value=httpx.Response(200, json=create_mock_user_data('wechat_open'))
+    )
+    await cache.get_userinfo(TEST_ACCESS_TOKEN, openid='o1')
+    await cache.get_userinfo(TEST_ACCESS_TOKEN, openid='o1')
+    await cache.get_userinfo(TEST_ACCESS_TOKEN, openid='o2')
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_invalidate(github_cache):
+    route = respx.get(GITHUB_USER_INFO_URL).mock(return_value=httpx.Response(200, json=create_mock_user_data('github')))
+    await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    await github_cache.invalidate(TEST_ACCESS_TOKEN)
+    await github_cache.get_userinfo(TEST_ACCESS_TOKEN)
+    assert route.call_count == 2